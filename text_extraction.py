@@ -0,0 +1,771 @@
+"""Document text extraction for WordCloud Magic.
+
+Extractor registry, archive access, the built-in extractors and the process
+pool that runs them. Extraction worker processes import only this module,
+so it must not import the GUI or its dependencies.
+"""
+import os
+import sys
+import io
+import re
+import threading
+import multiprocessing
+from multiprocessing.connection import wait as wait_for_connections
+from collections import Counter, deque
+from contextlib import contextmanager
+from time import time
+
+class Extractor:
+    """Text extractor for one or more file extensions.
+    
+    extract(filepath) yields pieces of text. Streaming extractors yield as
+    they read, so memory stays flat on huge files. Process-safe extractors
+    are module-level functions free of app state and may run in extraction
+    worker processes; isolated ones always do, because their parser can hang
+    or balloon on malformed files. split(filepath) may return (start, stop)
+    ranges for extract_range(filepath, start, stop) to extract in parallel;
+    it is only tried on files of at least split_min_bytes, and runs in a
+    worker process for isolated extractors.
+    For files too large to hold as text, count_ranges(filepath) may return
+    ranges whose word counts count_range(filepath, start, stop) returns
+    directly as a Counter. version must be bumped whenever a change to the
+    extractor changes its output, so cached text from older versions is not
+    served (see cache_tag).
+    """
+    
+    def __init__(self, extensions, extract, streaming=False, process_safe=True, isolated=True,
+                 split=None, split_min_bytes=0, extract_range=None, count_ranges=None, count_range=None,
+                 version=1):
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.extract = extract
+        self.streaming = streaming
+        self.process_safe = process_safe
+        self.isolated = isolated and process_safe
+        self.split = split
+        self.split_min_bytes = split_min_bytes
+        self.extract_range = extract_range
+        self.count_ranges = count_ranges
+        self.count_range = count_range
+        self.version = version
+    
+    @property
+    def cache_tag(self):
+        """Identifies this extractor's output format in cache keys"""
+        return f"{self.extract.__name__}.v{self.version}"
+    
+    def __repr__(self):
+        return f"Extractor({self.extract.__name__}, {', '.join(self.extensions)})"
+
+# Registered extractors by lower-case extension, in registration order
+EXTRACTORS = {}
+
+def register_extractor(extensions, **options):
+    """Decorator registering a text extractor for the given extensions (see Extractor)"""
+    def decorator(extract):
+        extractor = Extractor(extensions, extract, **options)
+        for ext in extractor.extensions:
+            EXTRACTORS[ext] = extractor
+        return extract
+    return decorator
+
+def get_extractor(filepath):
+    """Return the Extractor for a file, or None if its type isn't supported"""
+    return EXTRACTORS.get(os.path.splitext(filepath)[1].lower())
+
+def supported_extensions():
+    """Extensions of the document types that can be loaded"""
+    return tuple(EXTRACTORS)
+
+# Archives are scanned as virtual folders; their members are read without unpacking to disk
+ARCHIVE_EXTENSIONS = ('.zip', '.tar.gz', '.tgz', '.gz')
+
+def scan_extensions():
+    """Extensions picked up by a folder scan - documents plus archives"""
+    return supported_extensions() + ARCHIVE_EXTENSIONS
+
+def archive_kind(name):
+    """Return 'zip', 'tar' or 'gz' for an archive file name, or None"""
+    lower = name.lower()
+    if lower.endswith('.zip'):
+        return 'zip'
+    if lower.endswith(('.tar.gz', '.tgz')):
+        return 'tar'
+    if lower.endswith('.gz'):
+        return 'gz'
+    return None
+
+def split_archive_path(path):
+    """Split a path inside an archive into (archive path, member name), or return None"""
+    parts = path.split(os.sep)
+    for i in range(1, len(parts)):
+        if archive_kind(parts[i - 1]):
+            archive = os.sep.join(parts[:i])
+            if os.path.isfile(archive):
+                return archive, '/'.join(parts[i:])
+    return None
+
+def list_archive(archive):
+    """Return the sorted member names (with '/' separators) of supported documents in an archive.
+    
+    Zip archives are listed from their central directory; a .tar.gz has to be
+    decompressed once from start to end; a .gz holds a single file named
+    after the archive.
+    """
+    extensions = supported_extensions()
+    kind = archive_kind(archive)
+    if kind == 'zip':
+        import zipfile
+        with zipfile.ZipFile(archive) as zf:
+            names = [info.filename for info in zf.infolist() if not info.is_dir()]
+    elif kind == 'tar':
+        import tarfile
+        with tarfile.open(archive, 'r|gz') as tf:
+            names = [_tar_member_name(member) for member in tf if member.isfile()]
+    elif kind == 'gz':
+        names = [os.path.basename(archive)[:-3]]
+    else:
+        return []
+    return sorted(name for name in names if name.lower().endswith(extensions))
+
+def _tar_member_name(member):
+    """Tar member name without a leading './' or '/'"""
+    import posixpath
+    return posixpath.normpath(member.name).lstrip('/')
+
+def iter_archive_members(archive, members):
+    """Yield (member name, bytes) for the wanted members in one sequential pass over an archive"""
+    members = set(members)
+    kind = archive_kind(archive)
+    if kind == 'tar':
+        import tarfile
+        with tarfile.open(archive, 'r|gz') as tf:
+            for member in tf:
+                if member.isfile() and _tar_member_name(member) in members:
+                    yield _tar_member_name(member), tf.extractfile(member).read()
+    else:
+        for name in sorted(members):
+            with open_document(os.path.join(archive, *name.split('/'))) as f:
+                yield name, f.read()
+
+@contextmanager
+def open_document(source, seekable=False):
+    """Open a document for binary reading.
+    
+    source is a file path, a path inside an archive (see split_archive_path)
+    or an already open binary file. Archive members are streamed straight
+    from the archive; seekable=True buffers them in memory for parsers that
+    need random access.
+    """
+    if not isinstance(source, str):
+        yield source
+        return
+    archive_path = None if os.path.isfile(source) else split_archive_path(source)
+    if archive_path is None:
+        with open(source, 'rb') as f:
+            yield f
+        return
+    archive, member = archive_path
+    kind = archive_kind(archive)
+    if kind == 'zip':
+        import zipfile
+        with zipfile.ZipFile(archive) as zf, zf.open(member) as f:
+            yield io.BytesIO(f.read()) if seekable else f
+    elif kind == 'gz':
+        import gzip
+        if member != os.path.basename(archive)[:-3]:
+            raise FileNotFoundError(f"{member} not found in {os.path.basename(archive)}")
+        with gzip.open(archive, 'rb') as f:
+            yield io.BytesIO(f.read()) if seekable else f
+    else:
+        # Random access into a .tar.gz decompresses everything before the member
+        import tarfile
+        with tarfile.open(archive, 'r:gz') as tf:
+            for info in tf:
+                if info.isfile() and _tar_member_name(info) == member:
+                    f = tf.extractfile(info)
+                    yield io.BytesIO(f.read()) if seekable else f
+                    return
+        raise FileNotFoundError(f"{member} not found in {os.path.basename(archive)}")
+
+# Word tokens - include apostrophes for contractions
+WORD_PATTERN = re.compile(r"\b[\w']+\b")
+
+def tokenize_text(text):
+    """Return the case-folded word tokens of a text"""
+    return WORD_PATTERN.findall(text.lower())
+
+# Large PDFs are split into page ranges of this size for parallel extraction
+PDF_PAGES_PER_TASK = 100
+PDF_SPLIT_MIN_BYTES = 2 * 1024 * 1024  # Smaller PDFs aren't worth counting pages for
+
+def iter_pdf_text(filepath, start=0, stop=None):
+    """Yield the text of PDF pages [start, stop), one page at a time"""
+    import PyPDF2
+    with open_document(filepath, seekable=True) as f:
+        pdf_reader = PyPDF2.PdfReader(f)
+        pages = pdf_reader.pages
+        stop = len(pages) if stop is None else min(stop, len(pages))
+        for page_number in range(start, stop):
+            page_text = pages[page_number].extract_text()
+            # Fix common PDF extraction issues
+            # Replace soft hyphens and rejoin split words
+            page_text = page_text.replace('\u00AD', '')  # Remove soft hyphens
+            page_text = page_text.replace('-\n', '')  # Rejoin hyphenated words
+            page_text = page_text.replace('\n', ' ')  # Replace newlines with spaces
+            yield page_text + " "
+
+def extract_pdf_text(filepath, start=0, stop=None):
+    """Extract text from PDF pages [start, stop)"""
+    return ''.join(iter_pdf_text(filepath, start, stop))
+
+def pdf_page_ranges(filepath, pages_per_task=PDF_PAGES_PER_TASK):
+    """Split a large PDF into (start, stop) page ranges, or return None to extract it whole"""
+    try:
+        if os.path.getsize(filepath) < PDF_SPLIT_MIN_BYTES:
+            return None
+        import PyPDF2
+        with open(filepath, 'rb') as f:
+            page_count = len(PyPDF2.PdfReader(f).pages)
+    except Exception:
+        return None  # Let whole-file extraction report the error
+    if page_count <= pages_per_task:
+        return None
+    return [(start, min(start + pages_per_task, page_count))
+            for start in range(0, page_count, pages_per_task)]
+
+# Plain text is read in blocks of this many characters
+TEXT_BLOCK_CHARS = 4 * 1024 * 1024
+
+# Plain text files this large are counted in byte-range chunks instead of being loaded
+CHUNKED_TEXT_MIN_BYTES = 64 * 1024 * 1024
+TEXT_CHUNK_BYTES = 4 * 1024 * 1024
+_CHUNK_BREAK = re.compile(rb'[ \t\r\n]')
+_BREAK_SCAN_BYTES = 64 * 1024  # Read ahead in blocks this large when looking for a chunk break
+
+def text_file_ranges(filepath, chunk_bytes=TEXT_CHUNK_BYTES, min_bytes=CHUNKED_TEXT_MIN_BYTES):
+    """Split a large text file into byte ranges that end just after whitespace.
+    
+    Returns None for files smaller than min_bytes. Whitespace is ASCII, so no
+    token and no UTF-8 sequence straddles two ranges; a whitespace-free run
+    longer than a chunk is cut at a character boundary instead. Only the
+    bytes around each cut are read, never the whole file.
+    """
+    size = os.path.getsize(filepath)
+    if size < max(min_bytes, 1):
+        return None
+    ranges = []
+    with open(filepath, 'rb') as f:
+        start = 0
+        while start < size:
+            stop = min(start + chunk_bytes, size)
+            if stop < size:
+                match = None
+                pos, limit = stop, min(stop + chunk_bytes, size)
+                f.seek(pos)
+                while pos < limit:
+                    block = f.read(min(_BREAK_SCAN_BYTES, limit - pos))
+                    if not block:
+                        break
+                    match = _CHUNK_BREAK.search(block)
+                    if match:
+                        break
+                    pos += len(block)
+                if match:
+                    stop = pos + match.end()
+                else:
+                    # Back up over UTF-8 continuation bytes (at most three)
+                    low = max(start + 1, stop - 3)
+                    f.seek(low)
+                    tail = f.read(stop - low + 1)
+                    while stop > low and tail[stop - low] & 0xC0 == 0x80:
+                        stop -= 1
+            ranges.append((start, stop))
+            start = stop
+    return ranges
+
+def read_text_range(filepath, start, stop):
+    """Return the text in bytes [start, stop) of a UTF-8 text file.
+    
+    Reads just that range rather than mapping the file, so a chunk of a
+    multi-GB file fits within a worker's memory limit.
+    """
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        return f.read(stop - start).decode('utf-8')
+
+def count_text_range(filepath, start, stop):
+    """Count the word tokens in bytes [start, stop) of a UTF-8 text file"""
+    return Counter(tokenize_text(read_text_range(filepath, start, stop)))
+
+# Extracted texts are tokenized in worker processes once there is this much of them
+PARALLEL_TOKENIZE_MIN_CHARS = 32 * 1024 * 1024
+PARALLEL_TOKENIZE_MIN_DOC_CHARS = 1024 * 1024  # Smaller documents aren't worth shipping to a worker
+TOKENIZE_CHUNK_CHARS = 4 * 1024 * 1024
+_WHITESPACE = re.compile(r'\s')
+
+def split_text_chunks(text, chunk_chars=TOKENIZE_CHUNK_CHARS):
+    """Yield slices of about chunk_chars characters that end at whitespace, so no word is split"""
+    start = 0
+    while start < len(text):
+        stop = start + chunk_chars
+        if stop >= len(text):
+            yield text[start:]
+            return
+        cut = max(text.rfind(' ', start, stop), text.rfind('\n', start, stop))
+        if cut < start:
+            # No whitespace in this stretch - extend to the next
+            match = _WHITESPACE.search(text, stop)
+            cut = match.start() if match else len(text) - 1
+        yield text[start:cut + 1]
+        start = cut + 1
+
+@register_extractor(('.txt',), streaming=True, isolated=False, extract_range=read_text_range,
+                    count_ranges=text_file_ranges, count_range=count_text_range)
+def iter_txt_text(filepath):
+    """Yield a UTF-8 text file in blocks"""
+    with open_document(filepath) as raw:
+        f = io.TextIOWrapper(raw, encoding='utf-8')
+        while True:
+            block = f.read(TEXT_BLOCK_CHARS)
+            if not block:
+                break
+            yield block
+    yield "\n"
+
+register_extractor(('.pdf',), streaming=True, split=pdf_page_ranges, split_min_bytes=PDF_SPLIT_MIN_BYTES,
+                   extract_range=extract_pdf_text)(iter_pdf_text)
+
+# Streamed text is yielded in pieces of at least this many characters
+STREAM_PIECE_CHARS = 64 * 1024
+
+# WordprocessingML tags by local name, in both the transitional and strict namespaces
+_DOCX_NAMESPACES = ('http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+                    'http://purl.oclc.org/ooxml/wordprocessingml/main')
+_DOCX_TAGS = {f'{{{ns}}}{name}': name for ns in _DOCX_NAMESPACES
+              for name in ('t', 'tab', 'br', 'cr', 'p')}
+_DOCX_HEADER_FOOTER = re.compile(r'word/(header|footer)\d*\.xml$')
+
+# DrawingML text tags (slides, notes, tables and grouped shapes)
+_DRAWINGML_NAMESPACES = ('http://schemas.openxmlformats.org/drawingml/2006/main',
+                         'http://purl.oclc.org/ooxml/drawingml/main')
+_PPTX_TAGS = {f'{{{ns}}}{name}': name for ns in _DRAWINGML_NAMESPACES
+              for name in ('t', 'br', 'p')}
+
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+def _iter_ooxml_paragraphs(stream, tags):
+    """Yield paragraph text from one Office Open XML part with incremental parsing.
+    
+    tags maps element tags to 't' (text), 'tab', 'br'/'cr' (line break) or
+    'p' (paragraph). Paragraphs nested in another one (text boxes) are kept
+    apart from it, and mc:Fallback copies of alternate content are skipped so
+    text boxes aren't read twice. Finished top-level elements (e.g.
+    paragraphs and whole tables) are dropped as soon as they end, so memory
+    doesn't grow with the document.
+    """
+    from xml.etree.ElementTree import iterparse
+    stack = []
+    runs = [[]]  # Pending runs per open paragraph, innermost last
+    skipping = 0  # Depth inside mc:Fallback elements
+    pending = []
+    pending_chars = 0
+    for event, elem in iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            if elem.tag == _MC_FALLBACK:
+                skipping += 1
+            elif not skipping and tags.get(elem.tag) == 'p':
+                runs.append([])
+            continue
+        stack.pop()
+        tag = tags.get(elem.tag)
+        if elem.tag == _MC_FALLBACK:
+            skipping -= 1
+        elif skipping:
+            pass
+        elif tag == 't':
+            if elem.text:
+                runs[-1].append(elem.text)
+        elif tag == 'tab':
+            runs[-1].append(' ')
+        elif tag in ('br', 'cr'):
+            runs[-1].append('\n')
+        elif tag == 'p':
+            paragraph = ''.join(runs.pop()) + '\n'
+            pending.append(paragraph)
+            pending_chars += len(paragraph)
+            if pending_chars >= STREAM_PIECE_CHARS:
+                yield ''.join(pending)
+                pending = []
+                pending_chars = 0
+        # Children of the part root and of its body element are done with once they end
+        if stack and len(stack) <= 2:
+            stack[-1].remove(elem)
+    if pending:
+        yield ''.join(pending)
+
+@register_extractor(('.docx',), streaming=True, version=3)  # 2: tables, headers and footers; 3: text boxes once
+def iter_docx_text(filepath):
+    """Yield the text of a Word document - body (including tables), then headers and footers"""
+    import zipfile
+    with open_document(filepath, seekable=True) as f, zipfile.ZipFile(f) as archive:
+        names = archive.namelist()
+        if 'word/document.xml' not in names:
+            raise ValueError("Not a Word document (word/document.xml missing)")
+        headers_footers = sorted((name for name in names if _DOCX_HEADER_FOOTER.match(name)),
+                                 key=lambda name: (not name.startswith('word/header'), name))
+        parts = ['word/document.xml'] + headers_footers
+        for name in parts:
+            with archive.open(name) as stream:
+                yield from _iter_ooxml_paragraphs(stream, _DOCX_TAGS)
+
+_RELATIONSHIP_TAG = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+
+def _read_relationships(archive, part_name):
+    """Return {relationship id: (type, part name)} for a part in an Office Open XML package"""
+    import posixpath
+    from xml.etree.ElementTree import fromstring
+    folder, name = posixpath.split(part_name)
+    rels_name = posixpath.join(folder, '_rels', name + '.rels')
+    try:
+        root = fromstring(archive.read(rels_name))
+    except KeyError:
+        return {}
+    relationships = {}
+    for rel in root.iter(_RELATIONSHIP_TAG):
+        if rel.get('TargetMode') == 'External':
+            continue
+        target = rel.get('Target', '')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        relationships[rel.get('Id')] = (rel.get('Type', ''), target)
+    return relationships
+
+def _pptx_slide_parts(archive):
+    """Return slide part names in presentation order"""
+    from xml.etree.ElementTree import iterparse
+    relationships = _read_relationships(archive, 'ppt/presentation.xml')
+    slides = []
+    with archive.open('ppt/presentation.xml') as stream:
+        for _, elem in iterparse(stream):
+            if elem.tag.endswith('}sldId'):
+                # The r:id attribute points at the slide part
+                for key, value in elem.attrib.items():
+                    if key.endswith('}id') and value in relationships:
+                        slides.append(relationships[value][1])
+    if not slides:
+        # No usable slide list - fall back to slide number order
+        number = lambda name: int(re.search(r'(\d+)\.xml$', name).group(1))
+        slides = sorted((name for name in archive.namelist()
+                         if re.match(r'ppt/slides/slide\d+\.xml$', name)), key=number)
+    return slides
+
+@register_extractor(('.pptx',), streaming=True, version=3)  # 2: tables, groups and speaker notes; 3: no mc:Fallback
+def iter_pptx_text(filepath):
+    """Yield the text of a PowerPoint presentation one slide at a time, speaker notes included.
+    
+    Reads every DrawingML paragraph in the slide part, so grouped shapes and
+    table cells are covered as well as plain text boxes.
+    """
+    import zipfile
+    with open_document(filepath, seekable=True) as f, zipfile.ZipFile(f) as archive:
+        if 'ppt/presentation.xml' not in archive.namelist():
+            raise ValueError("Not a PowerPoint presentation (ppt/presentation.xml missing)")
+        for slide_part in _pptx_slide_parts(archive):
+            parts = [slide_part]
+            parts.extend(target for rel_type, target in _read_relationships(archive, slide_part).values()
+                         if rel_type.endswith('/notesSlide'))
+            pieces = []
+            for part in parts:
+                try:
+                    with archive.open(part) as stream:
+                        pieces.extend(_iter_ooxml_paragraphs(stream, _PPTX_TAGS))
+                except KeyError:
+                    continue  # Dangling relationship
+            yield ''.join(pieces)
+
+def extract_file_text(filepath):
+    """Extract plain text from a supported document file"""
+    extractor = get_extractor(filepath)
+    if extractor is None:
+        raise ValueError(f"Unsupported file type: {os.path.basename(filepath)}")
+    return ''.join(extractor.extract(filepath))
+
+def _extract_file_text_worker(filepath):
+    """Process pool entry point - returns (text, error) instead of raising"""
+    try:
+        return extract_file_text(filepath), None
+    except Exception as e:
+        return "", str(e)
+
+def _extract_bytes_worker(name, data):
+    """Process pool entry point for a document already read into memory, e.g. a .tar.gz member"""
+    try:
+        return ''.join(get_extractor(name).extract(io.BytesIO(data))), None
+    except Exception as e:
+        return "", str(e)
+
+def _extract_range_worker(filepath, start, stop):
+    """Process pool entry point for one range of a large document (e.g. PDF pages)"""
+    try:
+        return get_extractor(filepath).extract_range(filepath, start, stop), None
+    except Exception as e:
+        return "", str(e)
+
+def _count_text_worker(text):
+    """Process pool entry point counting the words in one chunk of extracted text"""
+    try:
+        return Counter(tokenize_text(text)), None
+    except Exception as e:
+        return Counter(), str(e)
+
+def _count_range_worker(filepath, start, stop):
+    """Process pool entry point counting the words in one range of a large file"""
+    try:
+        return get_extractor(filepath).count_range(filepath, start, stop), None
+    except Exception as e:
+        return Counter(), str(e)
+
+def _split_worker(filepath):
+    """Process pool entry point returning a document's split ranges, e.g. PDF page ranges"""
+    try:
+        return get_extractor(filepath).split(filepath), None
+    except Exception as e:
+        return None, str(e)
+
+# Windows job object limit flag and information class for a per-process memory cap
+_JOB_OBJECT_LIMIT_PROCESS_MEMORY = 0x100
+_JOB_OBJECT_EXTENDED_LIMIT_INFORMATION = 9
+_worker_job = None  # Keeps the job handle open for the life of the worker
+
+def _limit_process_memory(limit_bytes):
+    """Cap this process's memory, returning False where the platform can't.
+    
+    POSIX uses an address-space rlimit. Windows puts the process in a job
+    object with a process memory limit; allocations past it fail, which
+    Python reports as MemoryError.
+    """
+    if sys.platform != 'win32':
+        try:
+            import resource
+            resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+            return True
+        except (ImportError, ValueError, OSError):
+            return False
+    
+    global _worker_job
+    import ctypes
+    from ctypes import wintypes
+    
+    class BasicLimits(ctypes.Structure):
+        _fields_ = [('PerProcessUserTimeLimit', ctypes.c_int64),
+                    ('PerJobUserTimeLimit', ctypes.c_int64),
+                    ('LimitFlags', wintypes.DWORD),
+                    ('MinimumWorkingSetSize', ctypes.c_size_t),
+                    ('MaximumWorkingSetSize', ctypes.c_size_t),
+                    ('ActiveProcessLimit', wintypes.DWORD),
+                    ('Affinity', ctypes.c_size_t),
+                    ('PriorityClass', wintypes.DWORD),
+                    ('SchedulingClass', wintypes.DWORD)]
+    
+    class IoCounters(ctypes.Structure):
+        _fields_ = [(name, ctypes.c_uint64) for name in (
+            'ReadOperationCount', 'WriteOperationCount', 'OtherOperationCount',
+            'ReadTransferCount', 'WriteTransferCount', 'OtherTransferCount')]
+    
+    class ExtendedLimits(ctypes.Structure):
+        _fields_ = [('BasicLimitInformation', BasicLimits),
+                    ('IoInfo', IoCounters),
+                    ('ProcessMemoryLimit', ctypes.c_size_t),
+                    ('JobMemoryLimit', ctypes.c_size_t),
+                    ('PeakProcessMemoryUsed', ctypes.c_size_t),
+                    ('PeakJobMemoryUsed', ctypes.c_size_t)]
+    
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    kernel32.SetInformationJobObject.argtypes = [wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, wintypes.DWORD]
+    kernel32.AssignProcessToJobObject.argtypes = [wintypes.HANDLE, wintypes.HANDLE]
+    
+    job = kernel32.CreateJobObjectW(None, None)
+    if not job:
+        return False
+    limits = ExtendedLimits()
+    limits.BasicLimitInformation.LimitFlags = _JOB_OBJECT_LIMIT_PROCESS_MEMORY
+    limits.ProcessMemoryLimit = limit_bytes
+    if not (kernel32.SetInformationJobObject(job, _JOB_OBJECT_EXTENDED_LIMIT_INFORMATION,
+                                             ctypes.byref(limits), ctypes.sizeof(limits))
+            and kernel32.AssignProcessToJobObject(job, kernel32.GetCurrentProcess())):
+        kernel32.CloseHandle(job)
+        return False
+    _worker_job = job
+    return True
+
+def _extraction_worker_main(conn, memory_limit_bytes):
+    """Extraction worker process loop - runs (function, args) tasks sent over a pipe"""
+    if memory_limit_bytes:
+        _limit_process_memory(memory_limit_bytes)
+    conn.send('ready')
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        worker, args = task
+        try:
+            result = worker(*args)
+        except MemoryError:
+            result = ("", "Memory limit exceeded")
+        conn.send(result)
+
+_START_LOCK = threading.Lock()
+
+def _start_process(process):
+    """Start a spawned worker process without re-running the app's main script in it.
+    
+    A spawned child normally imports the parent's __main__ module before it
+    unpickles its target - here that is the whole GUI. Pointing __main__ at
+    this module while the process starts makes the child import only this
+    module. Frozen executables start children through their own bootloader,
+    so they are left alone.
+    """
+    if getattr(sys, 'frozen', False):
+        process.start()
+        return
+    with _START_LOCK:
+        main = sys.modules['__main__']
+        sys.modules['__main__'] = sys.modules[__name__]
+        try:
+            process.start()
+        finally:
+            sys.modules['__main__'] = main
+
+class ExtractionPool:
+    """Process pool for document extraction with a watchdog.
+    
+    Each task gets a time limit; a worker that overruns it is killed and
+    replaced, and the task is reported as failed instead of stalling the
+    batch. Workers are recycled after max_tasks_per_worker tasks and run
+    under a memory limit (an rlimit on POSIX, a job object on Windows).
+    """
+    
+    POLL_INTERVAL = 0.5
+    
+    def __init__(self, workers, task_timeout=None, max_tasks_per_worker=None, memory_limit_mb=None):
+        self.workers = max(1, workers)
+        self.task_timeout = task_timeout or None
+        self.max_tasks_per_worker = max_tasks_per_worker or None
+        self.memory_limit_bytes = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        # Use spawn so workers never inherit Tk state from this process
+        self.context = multiprocessing.get_context('spawn')
+    
+    def _start_worker(self):
+        """Start a worker process and return its slot"""
+        parent_conn, child_conn = self.context.Pipe()
+        process = self.context.Process(target=_extraction_worker_main,
+                                       args=(child_conn, self.memory_limit_bytes),
+                                       daemon=True)
+        _start_process(process)
+        child_conn.close()
+        return {'process': process, 'conn': parent_conn, 'ready': False,
+                'key': None, 'started': None, 'completed': 0}
+    
+    def _stop_worker(self, slot, kill=False):
+        """Shut a worker down, killing it if it is stuck"""
+        if not kill:
+            try:
+                slot['conn'].send(None)
+            except OSError:
+                kill = True
+        if kill or not slot['ready']:
+            slot['process'].kill()
+        slot['process'].join(timeout=5)
+        slot['conn'].close()
+    
+    def run(self, tasks, on_result):
+        """Run (key, function, args) tasks, calling on_result(key, (text, error)) as each finishes.
+        
+        tasks may be a lazy iterator; only about one task per worker is drawn
+        from it ahead of time.
+        """
+        pending = iter(tasks)
+        queue = deque()
+        
+        def refill():
+            while len(queue) < self.workers:
+                task = next(pending, None)
+                if task is None:
+                    break
+                queue.append(task)
+        
+        refill()
+        slots = []
+        try:
+            while queue or any(slot['key'] is not None for slot in slots):
+                # Keep the pool full while there is work left
+                while queue and len(slots) < min(self.workers, len(queue) + sum(
+                        1 for slot in slots if slot['key'] is not None)):
+                    slots.append(self._start_worker())
+                
+                # Hand tasks to idle workers
+                for slot in slots:
+                    if slot['ready'] and slot['key'] is None and queue:
+                        key, worker, args = queue.popleft()
+                        slot['conn'].send((worker, args))
+                        slot['key'] = key
+                        slot['started'] = time()
+                refill()
+                
+                ready = wait_for_connections([slot['conn'] for slot in slots] +
+                                             [slot['process'].sentinel for slot in slots],
+                                             timeout=self.POLL_INTERVAL)
+                now = time()
+                for slot in list(slots):
+                    message = None
+                    if slot['conn'] in ready:
+                        try:
+                            message = slot['conn'].recv()
+                        except (EOFError, OSError):
+                            message = None
+                    if message == 'ready':
+                        slot['ready'] = True
+                        continue
+                    
+                    finished = None
+                    if message is not None:
+                        finished = message
+                    elif not slot['process'].is_alive():
+                        finished = ("", f"Worker process exited unexpectedly (exit code {slot['process'].exitcode})")
+                    elif (slot['key'] is not None and self.task_timeout
+                          and now - slot['started'] > self.task_timeout):
+                        finished = ("", f"Timed out after {self.task_timeout:g} seconds")
+                    
+                    if finished is None:
+                        continue
+                    
+                    key = slot['key']
+                    slot['key'] = None
+                    slot['completed'] += 1
+                    if key is not None:
+                        on_result(key, finished)
+                    
+                    # Replace dead, stuck and worn-out workers
+                    if message is None and not slot['ready']:
+                        raise OSError(f"Extraction worker failed to start: {finished[1]}")
+                    if message is None:
+                        self._stop_worker(slot, kill=True)
+                        slots.remove(slot)
+                    elif self.max_tasks_per_worker and slot['completed'] >= self.max_tasks_per_worker:
+                        self._stop_worker(slot)
+                        slots.remove(slot)
+        finally:
+            for slot in slots:
+                self._stop_worker(slot, kill=slot['key'] is not None)
+
+def default_extraction_workers():
+    """Default number of extraction worker processes"""
+    return max(1, os.cpu_count() or 1)
@@ -10,12 +10,21 @@ import tkinter as tk
 import tkinter.font as tkFont
 import os
 import sys
+import fnmatch
 import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 import numpy as np
 import platform
 import subprocess
 import json
+import hashlib
+import random
+import itertools
+import functools
+from array import array
+from collections import Counter, OrderedDict
 from wordcloud import WordCloud, STOPWORDS
 # Set matplotlib backend BEFORE importing pyplot
 import matplotlib
@@ -26,17 +35,20 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.colors import LinearSegmentedColormap
 plt.ioff()  # Turn off interactive mode to prevent popup windows
 
-# File handling imports
-import PyPDF2
-from docx import Document
-from pptx import Presentation
 import re
 from datetime import datetime
 from __version__ import __version__
+from text_extraction import (
+    get_extractor, scan_extensions, archive_kind, split_archive_path, list_archive,
+    iter_archive_members, tokenize_text, PARALLEL_TOKENIZE_MIN_CHARS,
+    PARALLEL_TOKENIZE_MIN_DOC_CHARS, split_text_chunks, _extract_file_text_worker,
+    _extract_bytes_worker, _extract_range_worker, _count_text_worker, _count_range_worker,
+    _split_worker, ExtractionPool, default_extraction_workers
+)
 
 def get_resource_path(relative_path):
-    # For config and log files, use platform-specific app data directory
-    if relative_path.startswith('configs') or relative_path.startswith('logs'):
+    # For config, log and cache files, use platform-specific app data directory
+    if relative_path.startswith(('configs', 'logs', 'cache')):
         if sys.platform == 'win32':
             # Windows: Use %APPDATA%/WordCloudMagic
             appdata_dir = os.environ.get('APPDATA', os.path.expanduser('~'))
@@ -63,6 +75,1017 @@ def debug_print(msg):
     """Print debug messages"""
     print(f"[DEBUG] {msg}")
 
+def list_directory(folder, extensions=None, with_stats=False):
+    """List one directory with os.scandir.
+    
+    Returns ({file name: (size, mtime_ns) or None}, [subdirectory names]) for
+    supported files only. File/directory checks use the cached DirEntry type;
+    file stats are only fetched when with_stats is set.
+    """
+    if extensions is None:
+        extensions = scan_extensions()
+    files = {}
+    subdirs = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    if entry.name.lower().endswith(extensions):
+                        if with_stats:
+                            stat = entry.stat()
+                            files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                        else:
+                            files[entry.name] = None
+                elif entry.is_dir():
+                    subdirs.append(entry.name)
+            except OSError:
+                continue
+    return files, subdirs
+
+class ScanRules:
+    """Include/exclude globs, per-extension size limits and a file cap for folder scans.
+    
+    Patterns without a '/' match file and folder names (e.g. 'node_modules',
+    '~$*', '*.tmp'); patterns with a '/' match the path relative to the
+    working folder (e.g. 'archive/2019/*'). Matching ignores case. Excluded
+    folders are never listed, and include patterns only apply to files.
+    """
+    
+    def __init__(self, include=(), exclude=(), size_limits_mb=None, max_files=0):
+        self.include = [pattern.strip() for pattern in include if pattern.strip()]
+        self.exclude = [pattern.strip() for pattern in exclude if pattern.strip()]
+        self.size_limits_mb = {'.' + ext.lower().lstrip('*.'): float(limit)
+                               for ext, limit in (size_limits_mb or {}).items()}
+        self.max_files = max(0, int(max_files or 0))
+        self._include = self._compile(self.include)
+        self._exclude = self._compile(self.exclude)
+    
+    @staticmethod
+    def _compile(patterns):
+        """Combine name and path patterns into one regex each"""
+        name_patterns = [fnmatch.translate(p.lower()) for p in patterns if '/' not in p]
+        path_patterns = [fnmatch.translate(p.lower().strip('/')) for p in patterns if '/' in p]
+        return (re.compile('|'.join(name_patterns)) if name_patterns else None,
+                re.compile('|'.join(path_patterns)) if path_patterns else None)
+    
+    @staticmethod
+    def _matches(compiled, name, rel_path):
+        name_re, path_re = compiled
+        if name_re and name_re.match(name.lower()):
+            return True
+        return bool(path_re and path_re.match(rel_path.replace(os.sep, '/').lower()))
+    
+    @classmethod
+    def from_config(cls, config):
+        """Build rules from the scan_* keys of a saved configuration"""
+        return cls(config.get('scan_include', []), config.get('scan_exclude', []),
+                   config.get('scan_size_limits_mb', {}), config.get('scan_max_files', 0))
+    
+    def to_config(self):
+        return {
+            'scan_include': list(self.include),
+            'scan_exclude': list(self.exclude),
+            'scan_size_limits_mb': {ext.lstrip('.'): limit for ext, limit in self.size_limits_mb.items()},
+            'scan_max_files': self.max_files,
+        }
+    
+    def needs_stats(self):
+        """Size limits need file sizes from the lister"""
+        return bool(self.size_limits_mb)
+    
+    def allows_dir(self, name, rel_path):
+        return not self._matches(self._exclude, name, rel_path)
+    
+    def allows_file(self, name, rel_path, stats=None):
+        if self._matches(self._exclude, name, rel_path):
+            return False
+        if self.include and not self._matches(self._include, name, rel_path):
+            return False
+        limit = self.size_limits_mb.get(os.path.splitext(name)[1].lower())
+        return limit is None or stats is None or stats[0] <= limit * 1024 * 1024
+
+def iter_supported_files(base_folder, max_depth, extensions=None, lister=None, rules=None,
+                         archive_lister=None):
+    """Yield paths of supported files relative to base_folder, descending up to max_depth levels.
+    
+    Paths come out in sorted order, so results can be shown while the walk is
+    still running. lister(folder, rel_prefix) returns a directory's
+    (files, subdirs) and defaults to list_directory. Archives are walked
+    as folders, yielding paths like 'drop.zip/reports/q1.pdf'. Optional
+    ScanRules prune files and folders as they are listed and stop the walk
+    at rules.max_files. archive_lister(archive, rel_prefix) returns an
+    archive's member names and defaults to list_archive.
+    """
+    if lister is None:
+        with_stats = rules is not None and rules.needs_stats()
+        lister = lambda folder, rel_prefix: list_directory(folder, extensions, with_stats)
+    if archive_lister is None:
+        archive_lister = lambda archive, rel_prefix: list_archive(archive)
+    max_files = rules.max_files if rules is not None else 0
+    yielded = 0
+    # Stack items are (rel path, None) for files or (rel prefix, (path, depth, is archive)) for folders
+    stack = [('', (base_folder, 0, False))]
+    while stack:
+        rel_path, folder_info = stack.pop()
+        if folder_info is None:
+            yield rel_path
+            yielded += 1
+            if yielded == max_files:
+                return
+            continue
+        folder, depth, is_archive = folder_info
+        if is_archive:
+            stack.extend(reversed(_archive_children(folder, rel_path, max_depth - depth, rules,
+                                                    archive_lister)))
+            continue
+        try:
+            files, subdirs = lister(folder, rel_path)
+        except OSError:
+            # Skip directories we can't access
+            continue
+        children = []
+        for name, stats in files.items():
+            if archive_kind(name):
+                # Archives are folders, so only the exclude rules apply to them
+                if depth < max_depth and (rules is None or rules.allows_dir(name, rel_path + name)):
+                    children.append((rel_path + name + os.sep, (os.path.join(folder, name), depth + 1, True)))
+            elif rules is None or rules.allows_file(name, rel_path + name, stats):
+                children.append((rel_path + name, None))
+        if depth < max_depth:
+            children.extend((rel_path + name + os.sep, (os.path.join(folder, name), depth + 1, False))
+                            for name in subdirs
+                            if rules is None or rules.allows_dir(name, rel_path + name))
+        # Directory prefixes end in a separator, so this matches sorting the full paths
+        children.sort(key=lambda child: child[0], reverse=True)
+        stack.extend(children)
+
+def _archive_children(archive, rel_prefix, levels, rules=None, archive_lister=None):
+    """Walker entries for the members of an archive, nested at most levels folders deep"""
+    try:
+        if archive_lister is None:
+            members = list_archive(archive)
+        else:
+            members = archive_lister(archive, rel_prefix)
+    except Exception:
+        return []  # Skip unreadable or corrupt archives
+    children = []
+    for member in members:
+        parts = member.split('/')
+        if len(parts) - 1 > levels:
+            continue
+        rel_path = rel_prefix + os.sep.join(parts)
+        if rules is not None:
+            # Folders inside the archive are subject to the exclude rules too
+            dir_prefix = rel_prefix
+            allowed = True
+            for part in parts[:-1]:
+                if not rules.allows_dir(part, dir_prefix + part):
+                    allowed = False
+                    break
+                dir_prefix += part + os.sep
+            if not allowed or not rules.allows_file(parts[-1], rel_path):
+                continue
+        children.append((rel_path, None))
+    return children
+
+class ParallelLister:
+    """Lists directories ahead of the walker on a bounded thread pool.
+    
+    Wraps a lister for iter_supported_files. As soon as a directory has been
+    listed its subdirectories (within max_depth) are queued, so on
+    high-latency filesystems many listings are in flight at once while the
+    walker still consumes them in sorted order.
+    """
+    
+    DEFAULT_THREADS = 16
+    
+    def __init__(self, lister, max_depth, threads=DEFAULT_THREADS, rules=None):
+        self.lister = lister
+        self.max_depth = max_depth
+        self.rules = rules
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='scan')
+        self.futures = {}
+        self.lock = threading.Lock()
+    
+    def _list(self, folder, rel_prefix, depth):
+        files, subdirs = self.lister(folder, rel_prefix)
+        if depth < self.max_depth:
+            for name in subdirs:
+                if self.rules is not None and not self.rules.allows_dir(name, rel_prefix + name):
+                    continue  # The walker won't descend here
+                self._submit(os.path.join(folder, name), rel_prefix + name + os.sep, depth + 1)
+        return files, subdirs
+    
+    def _submit(self, folder, rel_prefix, depth):
+        with self.lock:
+            if rel_prefix in self.futures:
+                return
+            try:
+                self.futures[rel_prefix] = self.executor.submit(self._list, folder, rel_prefix, depth)
+            except RuntimeError:
+                pass  # Pool already shut down
+    
+    def __call__(self, folder, rel_prefix):
+        self._submit(folder, rel_prefix, rel_prefix.count(os.sep))
+        with self.lock:
+            future = self.futures.pop(rel_prefix)
+        return future.result()
+    
+    def close(self, wait=False):
+        """Stop listing ahead, e.g. when the scan is cancelled; wait=True also waits for running listings"""
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+class DirectoryIndex:
+    """Persistent per-folder snapshot used to rescan a tree incrementally.
+    
+    For every visited directory the index keeps its mtime, its supported
+    files with size and mtime, and its subdirectories. On a rescan a
+    directory whose mtime is unchanged is served from the snapshot instead of
+    being listed again. Editing a file in place does not touch its
+    directory's mtime, so such edits are only picked up once the directory
+    changes; loading still checks each file's size and mtime. Archive
+    member lists are kept too and reused while the archive's size and mtime
+    are unchanged, so a .tar.gz isn't decompressed again on every scan.
+    """
+    
+    # Directory mtimes this close to the scan time may still change within the same tick
+    MTIME_SETTLE_SECONDS = 2
+    
+    def __init__(self, base_folder, extensions=None):
+        self.base_folder = os.path.abspath(base_folder)
+        self.extensions = extensions if extensions is not None else scan_extensions()
+        folder_key = hashlib.sha1(self.base_folder.encode('utf-8')).hexdigest()
+        self.index_file = get_resource_path(os.path.join('cache', 'indexes', f"{folder_key}.json"))
+        self.old_dirs = {}
+        self.new_dirs = {}
+        self.old_archives = {}
+        self.new_archives = {}
+        self.had_index = False
+        self._load()
+    
+    def _load(self):
+        """Load the previous snapshot, ignoring a missing, corrupt or stale file"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('root') == self.base_folder and data.get('extensions') == list(self.extensions):
+                self.old_dirs = data['dirs']
+                self.old_archives = data.get('archives', {})
+                self.had_index = True
+        except (OSError, ValueError, KeyError, TypeError):
+            self.old_dirs = {}
+            self.old_archives = {}
+    
+    def list_directory(self, folder, rel_prefix):
+        """Lister for iter_supported_files that reuses unchanged directories"""
+        dir_mtime = os.stat(folder).st_mtime_ns
+        old = self.old_dirs.get(rel_prefix)
+        if old and old['mtime'] is not None and old['mtime'] == dir_mtime:
+            files = {name: tuple(stats) for name, stats in old['files'].items()}
+            subdirs = old['subdirs']
+        else:
+            files, subdirs = list_directory(folder, self.extensions, with_stats=True)
+        if time() - dir_mtime / 1e9 < self.MTIME_SETTLE_SECONDS:
+            dir_mtime = None  # Too recent to trust next time
+        self.new_dirs[rel_prefix] = {'mtime': dir_mtime, 'files': files, 'subdirs': subdirs}
+        return files, subdirs
+    
+    def list_archive(self, archive, rel_prefix):
+        """Archive lister for iter_supported_files that reuses unchanged member lists"""
+        st = os.stat(archive)
+        stats = [st.st_size, st.st_mtime_ns]
+        old = self.old_archives.get(rel_prefix)
+        if old and old['stats'] == stats:
+            members = old['members']
+        else:
+            members = list_archive(archive)
+        if time() - st.st_mtime_ns / 1e9 < self.MTIME_SETTLE_SECONDS:
+            stats = None  # Too recent to trust next time
+        self.new_archives[rel_prefix] = {'stats': stats, 'members': members}
+        return members
+    
+    @staticmethod
+    def _flatten(dirs, max_depth):
+        """rel path -> (size, mtime) for files in directories up to max_depth"""
+        flat = {}
+        for rel_prefix, record in dirs.items():
+            if rel_prefix.count(os.sep) <= max_depth:
+                for name, stats in record['files'].items():
+                    flat[rel_prefix + name] = tuple(stats)
+        return flat
+    
+    def _was_skipped(self, rel_prefix):
+        """True if an old directory still exists but this scan didn't visit it"""
+        while rel_prefix and rel_prefix not in self.new_dirs:
+            parent, name = os.path.split(rel_prefix[:-1])
+            parent = parent + os.sep if parent else ''
+            record = self.new_dirs.get(parent)
+            if record is not None:
+                return name in record['subdirs']
+            rel_prefix = parent
+        return False
+    
+    def finish(self, max_depth):
+        """Save the new snapshot and return (added, removed, modified) relative paths"""
+        # Directories left out by the depth, scan rules or file cap are kept as they were
+        skipped = {rel_prefix: record for rel_prefix, record in self.old_dirs.items()
+                   if self._was_skipped(rel_prefix)}
+        old_files = self._flatten({rel_prefix: record for rel_prefix, record in self.old_dirs.items()
+                                   if rel_prefix not in skipped}, max_depth)
+        new_files = self._flatten(self.new_dirs, max_depth)
+        added = sorted(path for path in new_files if path not in old_files)
+        removed = sorted(path for path in old_files if path not in new_files)
+        modified = sorted(path for path, stats in new_files.items()
+                          if path in old_files and old_files[path] != stats)
+        
+        dirs = dict(skipped)
+        dirs.update(self.new_dirs)
+        # Archives in skipped directories keep their member lists as well
+        archives = {rel_prefix: record for rel_prefix, record in self.old_archives.items()
+                    if self._was_skipped(rel_prefix)}
+        archives.update(self.new_archives)
+        data = {'root': self.base_folder, 'extensions': list(self.extensions), 'dirs': dirs,
+                'archives': archives}
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            tmp_path = self.index_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_file)
+        except OSError:
+            pass  # The index is only an optimization
+        return added, removed, modified
+
+def normalize_plurals(frequencies):
+    """Merge plural forms into their singular when both occur (mirrors WordCloud.generate)"""
+    merged = dict(frequencies)
+    for word, count in frequencies.items():
+        if word.endswith('s') and not word.endswith('ss'):
+            singular = word[:-1]
+            if singular in merged:
+                merged[singular] += count
+                del merged[word]
+    return merged
+
+# Stopword packs per language - English is wordcloud's STOPWORDS, the others
+# are bundled in stopwords/<code>.txt and only read when a document needs them
+STOPWORD_LANGUAGES = {'en': 'English', 'de': 'German', 'fr': 'French', 'es': 'Spanish'}
+
+@functools.lru_cache(maxsize=None)
+def load_stopwords(language):
+    """Return a language's stopword pack as a frozenset, reading it on first use"""
+    if language == 'en':
+        return frozenset(STOPWORDS)
+    path = get_resource_path(os.path.join('stopwords', f'{language}.txt'))
+    with open(path, 'r', encoding='utf-8') as f:
+        return frozenset(line.strip().lower() for line in f if line.strip() and not line.startswith('#'))
+
+# Most frequent character trigrams per language (words padded with spaces), by rank
+LANGUAGE_PROFILES = {
+    'en': (' th|the|he | an|and| to|re |nd |to |ing|ng |ver|ed | of|ent|ive|es |of |'
+           'ere|ve | be|ove| in|ts | ho|on |er |her|hat|at | ne| mo| li| it|ll |nt |'
+           ' wh|ers|rs |is |wit|ds |ies|an | bu|tha|ay |thi| st|al | fo|for|or |le |'
+           'ome| ha|tor|ry | wa|was'),
+    'de': ('en |er |die|ie | di| de|der|nd |und| un|sch|den| zu|nde| si|zu | be|ung|'
+           'gen|ier| ge|te | st|ten|ben|ver|ich| ei|ein|ch | ih|ihr|ren|che|hen|nge|'
+           ' wo|hre|re | in|in |end|ert|es |sen|ft |rde|ebe| ve|on |hr | me| is|ist|'
+           'st |ine|sie|ng |ss | au'),
+    'fr': ('es | de|nt |de | le|ent|les|le | et|et |our|re | la|la | vi|er | co|ur |'
+           'ait|lle|men| po| au|pou|ts | qu|con|ont|des|ue | ce|ce |ns |rs |ant|est|'
+           'que|end| en|ier|ais|enc| un|cha|ien|nts| es| du|du |tio| il| ch| a |ion|'
+           ' pl|eme| l |ire|com|un '),
+    'es': (' la| de|de |os |la |as |es | y |ien| lo|ra |en | es| co|que| ca|nte| pa|'
+           'ara|ent|par|el | qu|ue | no|con|los| se|se |est|da |do |ant|ar | mu| a |'
+           ' el|ida| po|por|ión| un|to | su|te | si| en|les|end| ha|ció|mo |ad |on |'
+           'un |nto|al |nde|na |cia'),
+}
+_LANGUAGE_RANKS = {language: {gram: rank for rank, gram in enumerate(profile.split('|'))}
+                   for language, profile in LANGUAGE_PROFILES.items()}
+LANGUAGE_SAMPLE_CHARS = 20000  # Leading characters of a document used for detection
+LANGUAGE_SAMPLE_TOKENS = 4000  # Leading tokens used when only a document's encoded tokens are left
+LANGUAGE_MIN_TRIGRAMS = 100    # Fewer distinct trigrams than this (about 25 words) is too little text to tell
+LANGUAGE_MIN_MARGIN = 0.1      # The runner-up must be at least this much (relatively) further away
+
+# Language of a document loaded while per-language stopwords were off - detected later if needed
+NOT_DETECTED = 'not-detected'
+
+def detect_language(text):
+    """Guess a document's language from its character trigram profile, or None if unsure"""
+    return detect_language_counts(Counter(tokenize_text(text[:LANGUAGE_SAMPLE_CHARS])))
+
+def detect_language_counts(word_counts):
+    """Guess a language from {word: count}, or None if unsure.
+    
+    Uses the rank-order ("out of place") distance between the most frequent
+    trigrams and each language profile. Short texts, and texts where the two
+    closest profiles are nearly as far away, are left undecided.
+    """
+    counts = Counter()
+    for word, count in word_counts.items():
+        if word.isalpha():
+            padded = f' {word} '
+            for i in range(len(padded) - 2):
+                counts[padded[i:i + 3]] += count
+    if len(counts) < LANGUAGE_MIN_TRIGRAMS:
+        return None
+    document = {gram: rank for rank, (gram, _) in enumerate(counts.most_common(300))}
+    penalty = len(document)
+    distances = sorted((sum(abs(rank - document[gram]) if gram in document else penalty
+                            for gram, rank in ranks.items()), language)
+                       for language, ranks in _LANGUAGE_RANKS.items())
+    (best_distance, best), (runner_up, _) = distances[0], distances[1]
+    if runner_up - best_distance < LANGUAGE_MIN_MARGIN * runner_up:
+        return None
+    return best
+
+class ForbiddenMatcher:
+    """Compiled forbidden-word list supporting wildcards and regular expressions.
+    
+    One entry per line: plain words match exactly, 'pre*' matches by prefix,
+    '*suf' by suffix, other globs ('*mid*', 'colo?r') and 're:<pattern>' or
+    '/<pattern>/' entries as case-insensitive regexes matching the whole word.
+    Exact words go in a set, prefixes and suffixes in character tries, and
+    regexes are combined into a single compiled pattern, except those with
+    groups or inline global flags, which can't be joined safely and are
+    matched one by one. Verdicts are computed once per vocabulary id and
+    cached, so the cost grows with the number of unique words, not with the
+    corpus.
+    """
+    
+    _END = ''  # Trie key marking the end of a pattern
+    _GLOBAL_FLAGS = re.compile(r'\(\?[aiLmsux]+\)')  # e.g. (?i), only valid at the start of a pattern
+    
+    def __init__(self, patterns=()):
+        self.exact = set()
+        self.prefixes = {}
+        self.suffixes = {}
+        self.errors = []  # (pattern, message) for regexes that don't compile
+        self.count = 0
+        regexes = []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern:
+                continue
+            self.count += 1
+            if pattern.lower().startswith('re:'):
+                regexes.append(pattern[3:])
+            elif len(pattern) > 2 and pattern.startswith('/') and pattern.endswith('/'):
+                regexes.append(pattern[1:-1])
+            elif not any(c in pattern for c in '*?['):
+                self.exact.add(pattern.lower())
+            elif pattern.endswith('*') and not any(c in pattern[:-1] for c in '*?['):
+                self._insert(self.prefixes, pattern[:-1].lower())
+            elif pattern.startswith('*') and not any(c in pattern[1:] for c in '*?['):
+                self._insert(self.suffixes, pattern[:0:-1].lower())
+            else:
+                regexes.append(fnmatch.translate(pattern.lower()))
+        self.exact = frozenset(self.exact)
+        self.regex, self.separate = self._compile(regexes)
+        self._vocabulary = None
+        self._mask = np.zeros(0, dtype=bool)
+    
+    def _compile(self, regexes):
+        """Return (combined pattern or None, patterns matched separately), dropping any that don't compile"""
+        combinable, separate = [], []
+        for regex in regexes:
+            try:
+                compiled = re.compile(regex, re.IGNORECASE)
+            except re.error as e:
+                self.errors.append((regex, str(e)))
+                continue
+            # Group numbers and names, and global flags, change meaning when patterns are joined
+            if compiled.groups or self._GLOBAL_FLAGS.search(regex):
+                separate.append(compiled)
+            else:
+                combinable.append(regex)
+        if not combinable:
+            return None, separate
+        try:
+            combined = re.compile('|'.join(f'(?:{regex})' for regex in combinable), re.IGNORECASE)
+        except re.error:
+            combined = None
+            separate.extend(re.compile(regex, re.IGNORECASE) for regex in combinable)
+        return combined, separate
+    
+    @classmethod
+    def _insert(cls, trie, key):
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[cls._END] = True
+    
+    @classmethod
+    def _walk(cls, trie, chars):
+        """True if any pattern in the trie is a prefix of chars"""
+        node = trie
+        if cls._END in node:
+            return True
+        for char in chars:
+            node = node.get(char)
+            if node is None:
+                return False
+            if cls._END in node:
+                return True
+        return False
+    
+    def __len__(self):
+        return self.count
+    
+    def __contains__(self, word):
+        return (word in self.exact
+                or (self.prefixes and self._walk(self.prefixes, word))
+                or (self.suffixes and self._walk(self.suffixes, reversed(word)))
+                or (self.regex is not None and self.regex.fullmatch(word) is not None)
+                or any(regex.fullmatch(word) is not None for regex in self.separate))
+    
+    def mask(self, vocabulary, size=None):
+        """Boolean array marking vocabulary ids whose canonical word is forbidden"""
+        canonical = vocabulary.attributes()[0]
+        size = len(canonical) if size is None else size
+        if vocabulary is not self._vocabulary:
+            self._vocabulary = vocabulary
+            self._mask = np.zeros(0, dtype=bool)
+        known = len(self._mask)
+        if size > known:
+            # Only words added since the last call need matching
+            new = np.fromiter((w in self for w in canonical[known:size]), dtype=bool, count=size - known)
+            self._mask = np.concatenate([self._mask, new])
+        return self._mask[:size]
+
+def file_content_hash(filepath, chunk_size=1024 * 1024):
+    """Return a hex digest of the file's bytes"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class Vocabulary:
+    """Maps case-folded words to compact integer ids shared by encoded documents"""
+    
+    def __init__(self):
+        self.ids = {}
+        self.words = []
+        self.lock = threading.Lock()
+        # Per-id attributes, extended lazily as the vocabulary grows
+        self.canonical = []  # Word with possessive 's removed, as WordCloud.generate did
+        self.lengths = np.zeros(0, dtype=np.int32)
+        self.numeric = np.zeros(0, dtype=bool)
+    
+    def __len__(self):
+        return len(self.words)
+    
+    def encode(self, tokens):
+        """Return an int32 id array for a list of tokens, adding unseen words"""
+        with self.lock:
+            ids = self.ids
+            for word in dict.fromkeys(tokens):
+                if word not in ids:
+                    ids[word] = len(self.words)
+                    self.words.append(word)
+            return np.fromiter(map(ids.__getitem__, tokens), dtype=np.int32, count=len(tokens))
+    
+    def encode_counts(self, counts):
+        """Return an int64 per-id count array for a {word: count} mapping, adding unseen words"""
+        ids = self.encode(list(counts))
+        result = np.zeros(int(ids.max()) + 1 if len(ids) else 0, dtype=np.int64)
+        result[ids] = np.fromiter(counts.values(), dtype=np.int64, count=len(ids))
+        return result
+    
+    def attributes(self):
+        """Return (canonical words, lengths, numeric flags) indexed by word id"""
+        with self.lock:
+            new_words = self.words[len(self.canonical):]
+            if new_words:
+                canonical = [w[:-2] if w.endswith("'s") else w for w in new_words]
+                self.canonical.extend(canonical)
+                self.lengths = np.concatenate([
+                    self.lengths, np.fromiter(map(len, canonical), dtype=np.int32, count=len(canonical))])
+                self.numeric = np.concatenate([
+                    self.numeric, np.fromiter((w.isdigit() for w in canonical), dtype=bool, count=len(canonical))])
+            return self.canonical, self.lengths, self.numeric
+
+
+class TokenCounts:
+    """A document held as per-id token counts instead of its token id sequence.
+    
+    Used for files too large to keep every token, such as plain text counted
+    in byte-range chunks. Counts can be added as chunks are counted.
+    """
+    
+    def __init__(self, counts=None):
+        self.counts = counts if counts is not None else np.zeros(0, dtype=np.int64)
+    
+    def add(self, counts):
+        """Add a per-id count array, growing to the longer of the two"""
+        if len(counts) > len(self.counts):
+            counts = counts.copy()
+            counts[:len(self.counts)] += self.counts
+            self.counts = counts
+        else:
+            self.counts[:len(counts)] += counts
+    
+    def __len__(self):
+        return int(self.counts.sum())
+
+class HeavyHitters:
+    """Bounded-memory approximate word counts for token streams of any size.
+    
+    A Misra-Gries summary keeps at most 2 * capacity candidate words and a
+    count-min sketch of depth x width counters estimates how often each
+    occurred. For a stream of N tokens a candidate's summary count is at
+    most N / (capacity + 1) below the truth and any word left out of the
+    summary occurred at most that often; the sketch overestimates by at most
+    e * N / width with probability 1 - exp(-depth). Estimates take the
+    tighter of the two upper bounds, so they never undercount. Both halves
+    are sized from memory_mb and accept Counters, so chunk counts merge
+    straight in.
+    """
+    
+    DEPTH = 4
+    BYTES_PER_CANDIDATE = 128  # Dict entry, word string and count
+    _PRIME = (1 << 31) - 1
+    
+    def __init__(self, memory_mb=8):
+        budget = max(1, memory_mb) * 1024 * 1024 // 2
+        self.width = max(1024, budget // (self.DEPTH * 8))
+        self.capacity = max(256, budget // (2 * self.BYTES_PER_CANDIDATE))
+        self.sketch = np.zeros((self.DEPTH, self.width), dtype=np.int64)
+        rng = np.random.default_rng(0x5EED)
+        self._hash_a = rng.integers(1, self._PRIME, self.DEPTH, dtype=np.uint64)[:, None]
+        self._hash_b = rng.integers(0, self._PRIME, self.DEPTH, dtype=np.uint64)[:, None]
+        self.counts = {}
+        self.total = 0
+        self.decrement = 0  # Total subtracted from every candidate so far
+        self.lock = threading.Lock()
+    
+    def _buckets(self, words):
+        """Sketch column of each word for every row"""
+        hashes = np.fromiter((hash(word) & 0x7FFFFFFF for word in words), dtype=np.uint64, count=len(words))
+        return (self._hash_a * hashes + self._hash_b) % self._PRIME % self.width
+    
+    def update(self, counter):
+        """Add a {word: count} mapping"""
+        if not counter:
+            return
+        words = list(counter)
+        values = np.fromiter(counter.values(), dtype=np.int64, count=len(words))
+        buckets = self._buckets(words)
+        with self.lock:
+            self.total += int(values.sum())
+            for row in range(self.DEPTH):
+                np.add.at(self.sketch[row], buckets[row], values)
+            counts = self.counts
+            for word, value in zip(words, values.tolist()):
+                counts[word] = counts.get(word, 0) + value
+            if len(counts) > 2 * self.capacity:
+                # Subtract the (capacity + 1)-th largest count from all, keeping at most capacity words
+                kept = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+                cut = int(np.partition(kept, len(kept) - self.capacity - 1)[len(kept) - self.capacity - 1])
+                self.decrement += cut
+                self.counts = {word: count - cut for word, count in counts.items() if count > cut}
+    
+    def items(self):
+        """Return {word: estimated count} for the candidate words"""
+        with self.lock:
+            words = list(self.counts)
+            lower = np.fromiter(self.counts.values(), dtype=np.int64, count=len(words))
+            if not words:
+                return {}
+            sketched = self.sketch[np.arange(self.DEPTH)[:, None], self._buckets(words)].min(axis=0)
+            estimates = np.minimum(sketched, lower + self.decrement)
+        return dict(zip(words, estimates.tolist()))
+    
+    def error_bounds(self):
+        """Return (max overcount of an estimate, max count of a word missing from the summary)"""
+        return min(self.decrement, int(np.e * self.total / self.width)), self.decrement
+    
+    def memory_bytes(self):
+        """Approximate memory held by the summary and sketch"""
+        return self.sketch.nbytes + len(self.counts) * self.BYTES_PER_CANDIDATE
+
+class TextCorpus:
+    """Loaded source documents, each encoded as an int32 array of vocabulary ids.
+    
+    The text itself is not kept: word counts for any document subset are a
+    single np.bincount over the encoded documents. Documents added with
+    add_document are already encoded (or counted, see TokenCounts).
+    """
+    
+    def __init__(self, text="", vocabulary=None, summary=None):
+        self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        self.summary = summary  # HeavyHitters in approximate mode - no text or tokens are kept
+        self.char_count = 0
+        self.documents = []  # (name, int32 token id array or TokenCounts) per document
+        self.languages = []  # Detected language code (None if unsure, or NOT_DETECTED) per document
+        self._token_counts = None
+        self._counts_lock = threading.Lock()
+        if text:
+            self.append(text)
+    
+    def append(self, text, name=None, tokens=None, language=None):
+        """Encode and add a document's text, returning its token ids (or the given, already counted tokens)"""
+        if self.summary is not None:
+            # Approximate mode: only the summary is kept (tokens given were already added to it)
+            if tokens is None:
+                self.summary.update(Counter(tokenize_text(text)))
+            with self._counts_lock:
+                self.char_count += len(text)
+            return None
+        token_ids = tokens if tokens is not None else self.vocabulary.encode(tokenize_text(text))
+        self.add_document(name, token_ids, len(text), language)
+        return token_ids
+    
+    def add_document(self, name, token_ids, char_count, language=None):
+        """Add an already encoded document"""
+        if self.summary is not None:
+            with self._counts_lock:
+                self.char_count += char_count
+            return
+        with self._counts_lock:
+            self.documents.append((name, token_ids))
+            self.languages.append(language)
+            self.char_count += char_count
+            self._token_counts = None
+    
+    def word_count(self):
+        """Total number of word tokens"""
+        if self.summary is not None:
+            return self.summary.total
+        return sum(len(ids) for _, ids in self.documents)
+    
+    def average_word_length(self):
+        """Mean token length in characters"""
+        if self.summary is not None:
+            # Estimated from the frequent words only
+            items = self.summary.items()
+            total = sum(items.values())
+            return sum(len(word) * count for word, count in items.items()) / total if total else 0
+        counts = self.token_counts()
+        total = counts.sum()
+        if not total:
+            return 0
+        lengths = np.fromiter(map(len, self.vocabulary.words[:len(counts)]), dtype=np.int64, count=len(counts))
+        return float((counts * lengths).sum() / total)
+    
+    @staticmethod
+    def _count(entries, size):
+        """Sum encoded and counted documents into one per-id count array"""
+        arrays = [ids for ids in entries if not isinstance(ids, TokenCounts)]
+        if arrays:
+            counts = np.bincount(np.concatenate(arrays), minlength=size)
+        else:
+            counts = np.zeros(size, dtype=np.int64)
+        for ids in entries:
+            if isinstance(ids, TokenCounts):
+                counts[:len(ids.counts)] += ids.counts
+        return counts
+    
+    def token_counts(self, doc_indices=None):
+        """Return per-id token counts for all documents (cached) or a subset of them"""
+        size = len(self.vocabulary)
+        if doc_indices is not None:
+            return self._count([self.documents[i][1] for i in doc_indices], size)
+        with self._counts_lock:
+            if self._token_counts is None or len(self._token_counts) != size:
+                self._token_counts = self._count([ids for _, ids in self.documents], size)
+            return self._token_counts
+    
+    def detect_languages(self, doc_indices=None):
+        """Detect the language of documents added as NOT_DETECTED from their encoded tokens"""
+        words = self.vocabulary.words
+        for i in (range(len(self.documents)) if doc_indices is None else doc_indices):
+            if self.languages[i] != NOT_DETECTED:
+                continue
+            ids = self.documents[i][1]
+            if isinstance(ids, TokenCounts):
+                # No token order left - the most frequent words stand in for the leading text
+                counts = ids.counts
+                top = np.argsort(counts)[::-1][:LANGUAGE_SAMPLE_TOKENS]
+            else:
+                counts = np.bincount(ids[:LANGUAGE_SAMPLE_TOKENS])
+                top = np.flatnonzero(counts)
+            self.languages[i] = detect_language_counts({words[j]: int(counts[j]) for j in top if counts[j]})
+    
+    def language_groups(self, doc_indices=None):
+        """Return {language: [document indices]} for all documents or a subset of them"""
+        groups = {}
+        for i in (range(len(self.documents)) if doc_indices is None else doc_indices):
+            groups.setdefault(self.languages[i], []).append(i)
+        return groups
+    
+    def __len__(self):
+        return self.char_count
+
+# Quick preview: token block size, and how many tokens to read per token kept in the sample
+PREVIEW_BLOCK_TOKENS = 1000
+PREVIEW_OVERSAMPLE = 2
+
+class BlockReservoir:
+    """Uniform random sample of fixed-size token blocks from a stream (reservoir sampling).
+    
+    Keeps at most budget tokens in blocks of block_tokens encoded ids, each
+    block in the stream being equally likely to be kept. Blocks are stored as
+    (token ids, label) so they remember e.g. their document's language.
+    """
+    
+    def __init__(self, budget, block_tokens=PREVIEW_BLOCK_TOKENS, rng=None):
+        self.capacity = max(1, budget // block_tokens)
+        self.block_tokens = block_tokens
+        self.rng = rng or random.Random()
+        self.blocks = []
+        self.seen_blocks = 0
+        self.seen_tokens = 0
+    
+    def add(self, token_ids, label=None):
+        """Offer one document's encoded tokens"""
+        self.seen_tokens += len(token_ids)
+        for start in range(0, len(token_ids), self.block_tokens):
+            self.seen_blocks += 1
+            if len(self.blocks) < self.capacity:
+                self.blocks.append((token_ids[start:start + self.block_tokens], label))
+            else:
+                slot = self.rng.randrange(self.seen_blocks)
+                if slot < self.capacity:
+                    self.blocks[slot] = (token_ids[start:start + self.block_tokens], label)
+
+def rank_stability(frequencies_for, block_count, top_n=50, rounds=20, rng=None):
+    """Bootstrap estimate of how well a sample's top words would hold up.
+    
+    frequencies_for(block_indices) returns the word frequencies of a list of
+    sampled blocks. Blocks are resampled with replacement and the result is
+    the mean share of the sample's top_n words that stay in the resample's
+    top_n, from 0 to 1.
+    """
+    rng = rng or random.Random()
+    top = lambda frequencies: set(sorted(frequencies, key=frequencies.get, reverse=True)[:top_n])
+    reference = top(frequencies_for(list(range(block_count))))
+    if not reference or block_count < 2:
+        return 0.0
+    overlap = 0
+    for _ in range(rounds):
+        resample = [rng.randrange(block_count) for _ in range(block_count)]
+        overlap += len(reference & top(frequencies_for(resample))) / len(reference)
+    return overlap / rounds
+
+class ExtractionCache:
+    """Persistent on-disk cache of extracted document text with LRU eviction.
+    
+    Files are fingerprinted by absolute path, size, mtime and content hash.
+    Extracted text is stored once per content hash and extractor version
+    (Extractor.cache_tag), so an unchanged file is served without hashing, a
+    touched-but-identical file only costs a hash, and text from an older
+    extractor is never served. The language detected for a stored text is
+    kept alongside it.
+    """
+    
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+    FORMAT = 2  # Bump when the index or key layout changes; older caches are discarded
+    
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(cache_dir, 'index.json')
+        self.lock = threading.Lock()
+        self.files = {}               # abs path -> {'size', 'mtime', 'hash'}
+        self.entries = OrderedDict()  # content hash -> stored bytes, least recently used first
+        self.languages = {}           # content hash -> detected language code
+        self.total_bytes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+    
+    def _load_index(self):
+        """Load the index from disk, ignoring a missing or corrupt file"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('format') != self.FORMAT:
+                self._discard_blobs()
+                return
+            self.files = data.get('files', {})
+            # Entries are saved in LRU order
+            for content_hash, size in data.get('entries', []):
+                if os.path.exists(self._blob_path(content_hash)):
+                    self.entries[content_hash] = size
+                    self.total_bytes += size
+            self.languages = {content_hash: language for content_hash, language in data.get('languages', {}).items()
+                              if content_hash in self.entries}
+        except (OSError, ValueError, TypeError, AttributeError):
+            self.files = {}
+            self.entries = OrderedDict()
+            self.languages = {}
+            self.total_bytes = 0
+    
+    def _discard_blobs(self):
+        """Delete text stored by an older cache format"""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.txt'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+    
+    def _blob_path(self, content_hash):
+        """Path of the stored text for a content hash"""
+        return os.path.join(self.cache_dir, f"{content_hash}.txt")
+    
+    def fingerprint(self, filepath):
+        """Return (abs_path, size, mtime_ns, key) for a file, the key being its content hash and extractor tag"""
+        abs_path = os.path.abspath(filepath)
+        stat = os.stat(abs_path)
+        extractor = get_extractor(abs_path)
+        tag = extractor.cache_tag if extractor is not None else 'none'
+        with self.lock:
+            record = self.files.get(abs_path)
+        if (record and record['size'] == stat.st_size and record['mtime'] == stat.st_mtime_ns
+                and record['hash'].endswith('-' + tag)):
+            content_hash = record['hash']
+        else:
+            content_hash = f"{file_content_hash(abs_path)}-{tag}"
+        return abs_path, stat.st_size, stat.st_mtime_ns, content_hash
+    
+    def get(self, fingerprint):
+        """Return cached text for a fingerprint, or None on a miss"""
+        abs_path, size, mtime, content_hash = fingerprint
+        with self.lock:
+            if content_hash not in self.entries:
+                return None
+            try:
+                with open(self._blob_path(content_hash), 'r', encoding='utf-8', errors='surrogatepass') as f:
+                    text = f.read()
+            except (OSError, ValueError):
+                self.total_bytes -= self.entries.pop(content_hash)
+                return None
+            self.entries.move_to_end(content_hash)
+            self.files[abs_path] = {'size': size, 'mtime': mtime, 'hash': content_hash}
+            return text
+    
+    def put(self, fingerprint, text):
+        """Store extracted text for a fingerprint, evicting old entries past the size cap"""
+        abs_path, size, mtime, content_hash = fingerprint
+        # PDF text can hold lone surrogates, which plain UTF-8 refuses
+        data = text.encode('utf-8', errors='surrogatepass')
+        if len(data) > self.max_bytes:
+            return
+        with self.lock:
+            blob_path = self._blob_path(content_hash)
+            tmp_path = blob_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, blob_path)
+            if content_hash in self.entries:
+                self.total_bytes -= self.entries[content_hash]
+            self.entries[content_hash] = len(data)
+            self.entries.move_to_end(content_hash)
+            self.total_bytes += len(data)
+            self.files[abs_path] = {'size': size, 'mtime': mtime, 'hash': content_hash}
+            self._evict()
+    
+    def get_language(self, abs_path, size, mtime):
+        """Return the language stored for an unchanged file's text, or None"""
+        with self.lock:
+            record = self.files.get(abs_path)
+            if record and record['size'] == size and record['mtime'] == mtime:
+                return self.languages.get(record['hash'])
+        return None
+    
+    def put_language(self, abs_path, language):
+        """Remember the language detected for a file whose text is stored"""
+        with self.lock:
+            record = self.files.get(abs_path)
+            if record and record['hash'] in self.entries:
+                self.languages[record['hash']] = language
+    
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its cap"""
+        evicted = set()
+        while self.total_bytes > self.max_bytes and self.entries:
+            content_hash, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            evicted.add(content_hash)
+            self.languages.pop(content_hash, None)
+            try:
+                os.remove(self._blob_path(content_hash))
+            except OSError:
+                pass
+        if evicted:
+            self.files = {path: record for path, record in self.files.items()
+                          if record['hash'] not in evicted}
+    
+    def save(self):
+        """Write the index to disk"""
+        with self.lock:
+            data = {
+                'format': self.FORMAT,
+                'files': self.files,
+                'entries': [[content_hash, size] for content_hash, size in self.entries.items()],
+                'languages': self.languages
+            }
+            tmp_path = self.index_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_file)
+
 class ToastManager:
     """Manages stacked toast notifications"""
     def __init__(self, root):
@@ -341,10 +1364,263 @@ class FontListbox(ttk.Frame):
         self.font_dict = font_dict
         self._populate_fonts()
 
+# Number of set bits for every byte value, used to count bitset selections
+_POPCOUNT_TABLE = bytes(bin(i).count('1') for i in range(256))
+
+class VirtualFileList(ttk.Frame):
+    """Virtualized multi-select file list for folders with very many files.
+    
+    Relative paths are packed into one UTF-8 buffer with an offset array,
+    the selection is a bitset, and only the rows in view are drawn.
+    """
+    ROW_HEIGHT = 22
+    
+    def __init__(self, master, height=6, font=('Segoe UI', 10), **kwargs):
+        super().__init__(master, **kwargs)
+        self.font = font
+        self._data = bytearray()          # UTF-8 relative paths back to back
+        self._offsets = array('Q', [0])   # Start of each path in _data, plus the end
+        self._selected = bytearray()      # Selection bitset by item index
+        self._view = None                 # Item indices matching the filter, or None for all
+        self._filter_terms = []
+        self._anchor = None               # View position of the last click for shift-select
+        self.message = ""
+        self.top = 0                      # First view position drawn
+        
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        
+        self.canvas = tk.Canvas(self,
+                               height=height * self.ROW_HEIGHT,
+                               borderwidth=0,
+                               highlightthickness=1,
+                               highlightbackground="#e0e0e0",
+                               highlightcolor="#0078d4")
+        self.canvas.grid(row=0, column=0, sticky=(N, S, E, W))
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky=(N, S))
+        
+        # Bind events
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<Shift-Button-1>', self._on_shift_click)
+        self.canvas.bind('<Configure>', lambda event: self.redraw())
+        self.canvas.bind('<MouseWheel>', self._on_mousewheel)
+        self.canvas.bind('<Button-4>', lambda event: self.yview('scroll', -3, 'units'))
+        self.canvas.bind('<Button-5>', lambda event: self.yview('scroll', 3, 'units'))
+        self.bind('<<ThemeChanged>>', lambda event: self.redraw())
+    
+    # Data
+    
+    def size(self):
+        """Total number of files, ignoring the filter"""
+        return len(self._offsets) - 1
+    
+    def view_size(self):
+        """Number of files matching the filter"""
+        return self.size() if self._view is None else len(self._view)
+    
+    def get(self, index):
+        """Relative path of an item"""
+        return self._data[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+    
+    def clear(self):
+        """Remove all files and selections"""
+        self._data = bytearray()
+        self._offsets = array('Q', [0])
+        self._selected = bytearray()
+        self._view = None if not self._filter_terms else array('I')
+        self._anchor = None
+        self.message = ""
+        self.top = 0
+        self.redraw()
+    
+    def append(self, paths):
+        """Append relative paths"""
+        start = self.size()
+        for path in paths:
+            self._data += path.encode('utf-8')
+            self._offsets.append(len(self._data))
+        self._selected.extend(bytes((self.size() + 7) // 8 - len(self._selected)))
+        if self._view is not None:
+            self._view.extend(i for i in range(start, self.size()) if self._matches(self.get(i)))
+        self.message = ""
+        self.redraw()
+    
+    def set_message(self, message):
+        """Text shown when the list is empty"""
+        self.message = message
+        self.redraw()
+    
+    # Filtering
+    
+    def _matches(self, path):
+        """Whether a path contains every filter term"""
+        path = path.lower()
+        return all(term in path for term in self._filter_terms)
+    
+    def set_filter(self, text):
+        """Show only files containing every space-separated term, e.g. 'report .pdf' or '*.docx'"""
+        self._filter_terms = [term.lstrip('*') for term in text.lower().split() if term.lstrip('*')]
+        if self._filter_terms:
+            self._view = array('I', (i for i in range(self.size()) if self._matches(self.get(i))))
+        else:
+            self._view = None
+        self._anchor = None
+        self.top = 0
+        self.redraw()
+    
+    def _item_at(self, position):
+        """Item index at a view position"""
+        return position if self._view is None else self._view[position]
+    
+    # Selection
+    
+    def is_selected(self, index):
+        """Whether an item is selected"""
+        return bool(self._selected[index >> 3] & (1 << (index & 7)))
+    
+    def _set_selected(self, index, selected):
+        if selected:
+            self._selected[index >> 3] |= 1 << (index & 7)
+        else:
+            self._selected[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+    
+    def select_all(self):
+        """Select every file in view"""
+        if self._view is None:
+            self._selected = bytearray(b'\xff' * len(self._selected))
+            extra_bits = len(self._selected) * 8 - self.size()
+            if extra_bits:
+                self._selected[-1] >>= extra_bits
+        else:
+            for index in self._view:
+                self._set_selected(index, True)
+        self.redraw()
+        self.event_generate('<<ListboxSelect>>')
+    
+    def clear_selection(self):
+        """Deselect every file"""
+        self._selected = bytearray(len(self._selected))
+        self._anchor = None
+        self.redraw()
+        self.event_generate('<<ListboxSelect>>')
+    
+    def _selected_indices(self):
+        """Selected item indices in view, in list order"""
+        if self._view is not None:
+            return [index for index in self._view if self.is_selected(index)]
+        indices = []
+        for byte_index, byte in enumerate(self._selected):
+            if byte:
+                indices.extend(byte_index * 8 + bit for bit in range(8) if byte & (1 << bit))
+        return indices
+    
+    def selection_count(self):
+        """Number of selected files in view"""
+        if self._view is not None:
+            return len(self._selected_indices())
+        return sum(self._selected.translate(_POPCOUNT_TABLE))
+    
+    def selected_paths(self):
+        """Relative paths of the selected files in view, in list order"""
+        return [self.get(index) for index in self._selected_indices()]
+    
+    # Drawing and scrolling
+    
+    def _visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.ROW_HEIGHT)
+    
+    def _colors(self):
+        """Current theme colors (background, text, selection background, selection text)"""
+        try:
+            colors = ttk.Style().colors
+            return colors.inputbg, colors.inputfg, colors.selectbg, colors.selectfg
+        except Exception:
+            return 'white', 'black', '#0078d4', 'white'
+    
+    def redraw(self):
+        """Draw the rows currently in view"""
+        canvas = self.canvas
+        canvas.delete('all')
+        bg, fg, select_bg, select_fg = self._colors()
+        canvas.configure(background=bg)
+        width = canvas.winfo_width()
+        total = self.view_size()
+        rows = self._visible_rows()
+        self.top = max(0, min(self.top, total - rows))
+        
+        if total == 0:
+            if self.message:
+                canvas.create_text(6, self.ROW_HEIGHT // 2, text=self.message,
+                                   anchor='w', font=self.font, fill=fg)
+            self.scrollbar.set(0, 1)
+            return
+        
+        for row in range(min(rows + 1, total - self.top)):
+            index = self._item_at(self.top + row)
+            path = self.get(index)
+            # Show subdirectory structure if present
+            label = f"📁 {path}" if os.path.sep in path else f"📄 {path}"
+            y = row * self.ROW_HEIGHT
+            text_color = fg
+            if self.is_selected(index):
+                canvas.create_rectangle(0, y, width, y + self.ROW_HEIGHT, fill=select_bg, width=0)
+                text_color = select_fg
+            canvas.create_text(6, y + self.ROW_HEIGHT // 2, text=label,
+                               anchor='w', font=self.font, fill=text_color)
+        
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + rows) / total))
+    
+    def yview(self, *args):
+        """Scrollbar command"""
+        total = self.view_size()
+        rows = self._visible_rows()
+        if args and args[0] == 'moveto':
+            self.top = int(float(args[1]) * total)
+        elif args and args[0] == 'scroll':
+            amount = int(args[1])
+            self.top += amount * rows if args[2] == 'pages' else amount
+        self.redraw()
+    
+    def _on_mousewheel(self, event):
+        """Handle mouse wheel scrolling"""
+        self.yview('scroll', int(-1 * (event.delta / 120)) * 3, 'units')
+    
+    def _position_at(self, event):
+        """View position under the mouse, or None"""
+        position = self.top + event.y // self.ROW_HEIGHT
+        return position if 0 <= position < self.view_size() else None
+    
+    def _on_click(self, event):
+        """Toggle the clicked file"""
+        position = self._position_at(event)
+        if position is None:
+            return
+        index = self._item_at(position)
+        self._set_selected(index, not self.is_selected(index))
+        self._anchor = position
+        self.redraw()
+        self.event_generate('<<ListboxSelect>>')
+    
+    def _on_shift_click(self, event):
+        """Select the range from the last clicked file"""
+        position = self._position_at(event)
+        if position is None:
+            return
+        anchor = position if self._anchor is None else self._anchor
+        for pos in range(min(anchor, position), max(anchor, position) + 1):
+            self._set_selected(self._item_at(pos), True)
+        self._anchor = position
+        self.redraw()
+        self.event_generate('<<ListboxSelect>>')
+
 class ModernWordCloudApp:
     # Application version
     VERSION = __version__
     
+    # Files inserted into the file list per UI update while scanning
+    FILE_LIST_BATCH_SIZE = 500
+    
     def print_debug(self, message):
         """Print debug message if in debug mode"""
         if hasattr(self, 'debug_mode') and self.debug_mode:
@@ -658,14 +1934,35 @@ class ModernWordCloudApp:
         
         # Variables
         self.working_folder = tk.StringVar(value="No folder selected")
-        self.text_content = ""
+        self.text_content = TextCorpus()
+        self.extraction_workers = tk.IntVar(value=default_extraction_workers())  # Processes used to extract file text
+        self.extraction_timeout = 120            # Seconds before a stuck file is skipped
+        self.extraction_memory_limit_mb = 2048   # Per-worker memory ceiling (where supported)
+        self.extraction_tasks_per_worker = 50    # Worker processes are recycled after this many files
+        self.vocabulary = Vocabulary()  # Shared by every loaded corpus so encoded files can be reused
+        self.file_scan_generation = 0   # Incremented to cancel an in-flight folder scan
+        self.depth_rescan_job = None
+        self.document_store = {}        # abs path -> encoded tokens of previously loaded files
+        self.approximate_counting = tk.BooleanVar(value=False)  # Bounded-memory heavy-hitter counts
+        self.approximate_memory_mb = tk.IntVar(value=8)
+        self.quick_preview = tk.BooleanVar(value=False)  # Generate from a sample first, exact counts later
+        self.preview_token_budget = tk.IntVar(value=2000000)
+        self.regenerate_pending = False  # Exact counts arrived while the preview was still generating
+        try:
+            self.extraction_cache = ExtractionCache(get_resource_path(os.path.join('cache', 'extraction')))
+        except Exception as e:
+            self.print_warning(f"Extraction cache disabled: {e}")
+            self.extraction_cache = None
         self.mask_image = None  # For backward compatibility
         self.image_mask_image = None  # Store image mask separately
         self.text_mask_image = None   # Store text mask separately
         self.mask_path = tk.StringVar(value="No mask selected")
         self.min_word_length = tk.IntVar(value=3)
         self.max_word_length = tk.IntVar(value=20)
-        self.forbidden_words = set()  # Start empty, will be populated from text area
+        self.forbidden_words = ForbiddenMatcher()  # Start empty, will be populated from text area
+        self._forbidden_source = None  # Text the matcher was compiled from
+        self.language_stopwords = tk.BooleanVar(value=False)  # Drop each document's own-language stopwords
+        self._stopword_matchers = {}  # Language code -> ForbiddenMatcher of its stopword pack
         self.selected_colormap = "viridis"
         self.color_mode = tk.StringVar(value="preset")  # "single", "preset", or "custom"
         self.single_color = tk.StringVar(value="#0078D4")
@@ -913,6 +2210,7 @@ class ModernWordCloudApp:
         ttk.Label(header_frame, text="Subfolder Depth:", font=('Segoe UI', 10)).pack(side=LEFT, padx=(0, 5))
         
         self.recursion_depth = tk.IntVar(value=0)
+        self.recursion_depth.trace_add('write', self.on_recursion_depth_change)
         self.depth_spinbox = ttk.Spinbox(header_frame, 
                                        from_=0, 
                                        to=10,
@@ -927,6 +2225,13 @@ class ModernWordCloudApp:
                   bootstyle="primary-outline",
                   width=10).pack(side=LEFT)
         
+        # List many directories at once - helps on high-latency network drives
+        self.parallel_scan = tk.BooleanVar(value=False)
+        ttk.Checkbutton(header_frame,
+                       text="Parallel scan",
+                       variable=self.parallel_scan,
+                       bootstyle="primary-round-toggle").pack(side=LEFT, padx=(10, 0))
+        
         folder_info = ttk.Frame(folder_frame)
         folder_info.pack(fill=X, pady=(0, 10))
         
@@ -941,6 +2246,38 @@ class ModernWordCloudApp:
                   bootstyle="primary",
                   width=20).pack()
         
+        # Scan rules - applied while walking, so excluded folders are never listed
+        rules_frame = ttk.Frame(folder_frame)
+        rules_frame.pack(fill=X, pady=(10, 0))
+        rules_frame.columnconfigure(1, weight=1)
+        rules_frame.columnconfigure(3, weight=1)
+        
+        self.scan_exclude = tk.StringVar(value="")
+        self.scan_include = tk.StringVar(value="")
+        self.scan_size_limits = tk.StringVar(value="")
+        self.scan_max_files = tk.IntVar(value=0)
+        
+        ttk.Label(rules_frame, text="Exclude:", font=('Segoe UI', 9)).grid(row=0, column=0, sticky=W, padx=(0, 5))
+        ttk.Entry(rules_frame, textvariable=self.scan_exclude).grid(row=0, column=1, sticky=EW, padx=(0, 10))
+        ttk.Label(rules_frame, text="Include:", font=('Segoe UI', 9)).grid(row=0, column=2, sticky=W, padx=(0, 5))
+        ttk.Entry(rules_frame, textvariable=self.scan_include).grid(row=0, column=3, sticky=EW)
+        
+        ttk.Label(rules_frame, text="Max MB:", font=('Segoe UI', 9)).grid(row=1, column=0, sticky=W, padx=(0, 5), pady=(5, 0))
+        ttk.Entry(rules_frame, textvariable=self.scan_size_limits).grid(row=1, column=1, sticky=EW, padx=(0, 10), pady=(5, 0))
+        ttk.Label(rules_frame, text="Max files:", font=('Segoe UI', 9)).grid(row=1, column=2, sticky=W, padx=(0, 5), pady=(5, 0))
+        ttk.Spinbox(rules_frame,
+                   from_=0,
+                   to=1000000,
+                   increment=100,
+                   textvariable=self.scan_max_files,
+                   width=8,
+                   bootstyle="primary").grid(row=1, column=3, sticky=W, pady=(5, 0))
+        
+        ttk.Label(rules_frame,
+                 text="Globs separated by commas, e.g. node_modules, ~$*, *.tmp · Max MB per type, e.g. pdf=200, pptx=50 · 0 files = no limit",
+                 font=('Segoe UI', 8),
+                 bootstyle="secondary").grid(row=2, column=0, columnspan=4, sticky=W, pady=(3, 0))
+        
         # Progress bar for file search (initially hidden)
         self.folder_progress_frame = ttk.Frame(folder_frame)
         self.folder_progress_frame.pack(fill=X, pady=(10, 0))
@@ -959,18 +2296,19 @@ class ModernWordCloudApp:
         # File selection
         file_frame = self.create_section(input_frame, "Select Files")
         
+        # Filter by name or extension
+        filter_row = ttk.Frame(file_frame)
+        filter_row.pack(fill=X, pady=(0, 5))
+        ttk.Label(filter_row, text="Filter:", font=('Segoe UI', 10)).pack(side=LEFT, padx=(0, 5))
+        self.file_filter = tk.StringVar(value="")
+        self.file_filter.trace_add('write', lambda *args: self.file_listbox.set_filter(self.file_filter.get()))
+        ttk.Entry(filter_row, textvariable=self.file_filter).pack(side=LEFT, fill=X, expand=TRUE)
+        
         # Create frame for listbox with border
         listbox_frame = ttk.Frame(file_frame, bootstyle="secondary", padding=1)
         listbox_frame.pack(fill=BOTH, expand=TRUE, pady=(0, 10))
         
-        self.file_listbox = tk.Listbox(listbox_frame,
-                                      selectmode=tk.MULTIPLE,
-                                      height=6,
-                                      font=('Segoe UI', 10),
-                                      borderwidth=0,
-                                      highlightthickness=1,
-                                      highlightbackground="#e0e0e0",
-                                      highlightcolor="#0078d4")
+        self.file_listbox = VirtualFileList(listbox_frame, height=6, font=('Segoe UI', 10))
         self.file_listbox.pack(fill=BOTH, expand=TRUE, padx=1, pady=1)
         
         # Button frame for file operations
@@ -995,6 +2333,47 @@ class ModernWordCloudApp:
                   bootstyle="success",
                   width=18).pack(side=LEFT)
         
+        # Number of worker processes used for text extraction
+        self.workers_spinbox = ttk.Spinbox(file_btn_frame,
+                                          from_=1,
+                                          to=64,
+                                          textvariable=self.extraction_workers,
+                                          width=4,
+                                          bootstyle="success")
+        self.workers_spinbox.pack(side=RIGHT)
+        ttk.Label(file_btn_frame, text="Workers:", font=('Segoe UI', 10)).pack(side=RIGHT, padx=(5, 5))
+        
+        # Approximate counting keeps a fixed-size summary instead of every token
+        approx_frame = ttk.Frame(file_frame)
+        approx_frame.pack(fill=X, pady=(5, 0))
+        ttk.Checkbutton(approx_frame,
+                       text="Approximate counts (bounded memory)",
+                       variable=self.approximate_counting,
+                       bootstyle="success-round-toggle").pack(side=LEFT)
+        ttk.Spinbox(approx_frame,
+                   from_=1,
+                   to=1024,
+                   textvariable=self.approximate_memory_mb,
+                   width=5,
+                   bootstyle="success").pack(side=RIGHT)
+        ttk.Label(approx_frame, text="Memory (MB):", font=('Segoe UI', 10)).pack(side=RIGHT, padx=(5, 5))
+        
+        # Quick preview generates from a sample while the full load runs
+        preview_frame = ttk.Frame(file_frame)
+        preview_frame.pack(fill=X, pady=(5, 0))
+        ttk.Checkbutton(preview_frame,
+                       text="Quick preview (sample first)",
+                       variable=self.quick_preview,
+                       bootstyle="success-round-toggle").pack(side=LEFT)
+        ttk.Spinbox(preview_frame,
+                   from_=PREVIEW_BLOCK_TOKENS,
+                   to=100000000,
+                   increment=500000,
+                   textvariable=self.preview_token_budget,
+                   width=10,
+                   bootstyle="success").pack(side=RIGHT)
+        ttk.Label(preview_frame, text="Sample words:", font=('Segoe UI', 10)).pack(side=RIGHT, padx=(5, 5))
+        
         # Progress bar for file loading (initially hidden)
         self.file_load_progress_frame = ttk.Frame(file_frame)
         self.file_load_progress_frame.pack(fill=X, pady=(10, 0))
@@ -1159,7 +2538,7 @@ class ModernWordCloudApp:
         forbidden_frame = self.create_section(filter_frame, "Forbidden Words")
         
         ttk.Label(forbidden_frame,
-                 text="Enter words to exclude (one per line):",
+                 text="Enter words to exclude (one per line, * wildcards or re:pattern):",
                  font=('Segoe UI', 10)).pack(anchor=W, pady=(0, 5))
         
         # Create frame for text widget with border
@@ -1180,6 +2559,11 @@ class ModernWordCloudApp:
         # Don't pre-populate here - let config loading handle it
         # If no config is loaded, we'll insert defaults later
         
+        ttk.Checkbutton(forbidden_frame,
+                       text="Remove stopwords in each document's language (EN/DE/FR/ES)",
+                       variable=self.language_stopwords,
+                       bootstyle="round-toggle").pack(anchor=W, pady=(0, 10))
+        
         ttk.Button(forbidden_frame,
                   text="Update Forbidden Words",
                   command=self.update_forbidden_words,
@@ -2800,9 +4184,17 @@ class ModernWordCloudApp:
         """Select working folder"""
         folder = filedialog.askdirectory()
         if folder:
+            if folder != self.working_folder.get():
+                self.reset_document_store()
             self.working_folder.set(folder)
             self.populate_file_list()
     
+    def reset_document_store(self):
+        """Forget encoded files from earlier loads"""
+        # Corpora already built keep a reference to the old vocabulary
+        self.vocabulary = Vocabulary()
+        self.document_store = {}
+    
     def refresh_file_list(self):
         """Refresh file list with current recursion depth"""
         self.populate_file_list(show_toast=True)
@@ -2810,58 +4202,122 @@ class ModernWordCloudApp:
     def populate_file_list(self, show_toast=True):
         """Populate file listbox with supported files"""
         self.print_debug(f"populate_file_list called, show_toast={show_toast}")
+        # A new scan supersedes any scan still running
+        self.file_scan_generation += 1
+        folder = self.working_folder.get()
+        try:
+            depth = self.recursion_depth.get()
+        except (tk.TclError, ValueError):
+            depth = 0
+        rules = self.get_scan_rules()
+        self._begin_file_list(self.file_scan_generation)
         # Run in a separate thread to avoid UI freezing
-        threading.Thread(target=self._populate_file_list_thread, args=(show_toast,), daemon=True).start()
-    
-    def _populate_file_list_thread(self, show_toast):
-        """Thread function to populate file list with recursive search"""
+        threading.Thread(target=self._populate_file_list_thread,
+                         args=(self.file_scan_generation, folder, depth, show_toast,
+                               self.parallel_scan.get(), rules),
+                         daemon=True).start()
+    
+    @staticmethod
+    def _split_patterns(text):
+        """Split a comma or semicolon separated list of globs"""
+        return [part.strip() for part in re.split(r'[,;]', text) if part.strip()]
+    
+    def get_scan_rules(self):
+        """Build ScanRules from the rule fields in the Working Folder section"""
+        size_limits = {}
+        for part in self._split_patterns(self.scan_size_limits.get()):
+            ext, sep, limit = part.replace(':', '=').partition('=')
+            try:
+                size_limits[ext.strip()] = float(limit)
+            except ValueError:
+                self.print_warning(f"Ignoring invalid size limit '{part}' (expected e.g. pdf=200)")
         try:
-
-            self.print_debug(f"_populate_file_list_thread started")
-            # Show progress bar
-            self.root.after(0, self._show_folder_progress)
-            
-            self.root.after(0, self.file_listbox.delete, 0, tk.END)
-            
-            folder = self.working_folder.get()
+            max_files = self.scan_max_files.get()
+        except (tk.TclError, ValueError):
+            max_files = 0
+        return ScanRules(self._split_patterns(self.scan_include.get()),
+                         self._split_patterns(self.scan_exclude.get()),
+                         size_limits, max_files)
+    
+    def set_scan_rules(self, rules):
+        """Show ScanRules in the rule fields"""
+        self.scan_include.set(", ".join(rules.include))
+        self.scan_exclude.set(", ".join(rules.exclude))
+        self.scan_size_limits.set(", ".join(f"{ext.lstrip('.')}={limit:g}"
+                                            for ext, limit in rules.size_limits_mb.items()))
+        self.scan_max_files.set(rules.max_files)
+    
+    def on_recursion_depth_change(self, *args):
+        """Cancel the running scan and rescan shortly after the depth changes"""
+        self.file_scan_generation += 1
+        if self.depth_rescan_job is not None:
+            self.root.after_cancel(self.depth_rescan_job)
+        self.depth_rescan_job = self.root.after(400, self._rescan_after_depth_change)
+    
+    def _rescan_after_depth_change(self):
+        """Debounced rescan for recursion depth changes"""
+        self.depth_rescan_job = None
+        if os.path.isdir(self.working_folder.get()):
+            self.populate_file_list(show_toast=False)
+    
+    def _populate_file_list_thread(self, generation, folder, depth, show_toast, parallel=False, rules=None):
+        """Thread function to stream the recursive search results to the file list in batches"""
+        lister = None
+        try:
+            self.print_debug(f"_populate_file_list_thread started (scan {generation})")
             self.print_debug(f"Working folder: {folder}")
             if folder and os.path.exists(folder):
-                depth = self.recursion_depth.get()
                 self.print_debug(f"Recursion depth: {depth}")
-                files_found = []
+                index = DirectoryIndex(folder)
+                lister = index.list_directory
+                if parallel:
+                    lister = ParallelLister(lister, depth, rules=rules)
+                batch = []
+                found = 0
+                last_flush = time()
+                for rel_path in iter_supported_files(folder, depth, lister=lister, rules=rules,
+                                                     archive_lister=index.list_archive):
+                    if generation != self.file_scan_generation:
+                        self.print_debug(f"Scan {generation} cancelled after {found} file(s)")
+                        return
+                    batch.append(rel_path)
+                    found += 1
+                    if len(batch) >= self.FILE_LIST_BATCH_SIZE or time() - last_flush >= 0.1:
+                        self.root.after(0, self._append_file_batch, generation, batch, found)
+                        batch = []
+                        last_flush = time()
+                if batch:
+                    self.root.after(0, self._append_file_batch, generation, batch, found)
+                self.print_debug(f"Files found: {found}")
+                if rules is not None and rules.max_files and found >= rules.max_files:
+                    self.print_warning(f"Scan stopped at the {rules.max_files} file limit")
+                
+                # Listings still running ahead of the walker (e.g. after the file cap) write to the index
+                if isinstance(lister, ParallelLister):
+                    lister.close(wait=True)
                 
-                # Recursive file search
-                self._search_files_recursive(folder, files_found, depth, 0)
-                self.print_debug(f"Files found: {len(files_found)}")
+                # Compare against the previous scan and save the new snapshot
+                changes = index.finish(depth)
+                if not index.had_index:
+                    changes = None  # First scan of this folder
+                else:
+                    self.print_debug(f"Index changes: {len(changes[0])} added, {len(changes[1])} removed, "
+                                     f"{len(changes[2])} modified")
                 
                 # Update UI in main thread
-                self.root.after(0, self._update_file_listbox, files_found, show_toast)
+                self.root.after(0, self._finish_file_list, generation, found, depth, show_toast, changes)
             else:
                 self.print_debug(f"Folder does not exist or is empty")
                 # Hide progress bar
-                self.root.after(0, self._hide_folder_progress)
+                self.root.after(0, self._finish_file_list, generation, None, depth, False)
         except Exception as e:
             self.print_debug(f"Error in _populate_file_list_thread: {str(e)}")
             import traceback
             self.print_debug(traceback.format_exc())
-    
-    def _search_files_recursive(self, folder, files_found, max_depth, current_depth):
-        """Recursively search for supported files"""
-        try:
-            for item in os.listdir(folder):
-                item_path = os.path.join(folder, item)
-                
-                if os.path.isfile(item_path):
-                    if item.lower().endswith(('.txt', '.pdf', '.docx', '.pptx')):
-                        # Store relative path from base folder
-                        rel_path = os.path.relpath(item_path, self.working_folder.get())
-                        files_found.append(rel_path)
-                elif os.path.isdir(item_path) and current_depth < max_depth:
-                    # Recursively search subdirectories
-                    self._search_files_recursive(item_path, files_found, max_depth, current_depth + 1)
-        except PermissionError:
-            # Skip directories we can't access
-            pass
+            self.root.after(0, self._finish_file_list, generation, None, depth, False)
+        finally:
+            if isinstance(lister, ParallelLister):
+                lister.close()
     
     def _show_folder_progress(self):
         """Show the folder search progress bar"""
@@ -2883,26 +4339,34 @@ class ModernWordCloudApp:
         self.file_load_progress.stop()
         self.file_load_progress_frame.pack_forget()
     
-    def _update_file_listbox(self, files_found, show_toast):
-        """Update file listbox with found files"""
-        if not files_found:
-            self.file_listbox.insert(tk.END, "No supported files found")
+    def _begin_file_list(self, generation):
+        """Clear the file list and show progress for a new scan"""
+        self.file_listbox.clear()
+        self.folder_progress_label.config(text="Searching for files...")
+        self._show_folder_progress()
+    
+    def _append_file_batch(self, generation, batch, found):
+        """Insert a batch of found files into the listbox"""
+        if generation != self.file_scan_generation:
+            return  # Batch from a superseded scan
+        self.file_listbox.append(batch)
+        self.folder_progress_label.config(text=f"Searching for files... ({found:,} found)")
+    
+    def _finish_file_list(self, generation, found, depth, show_toast, changes=None):
+        """Finish a scan once every batch has been inserted"""
+        if generation != self.file_scan_generation:
+            return
+        if found == 0:
+            self.file_listbox.set_message("No supported files found")
             if show_toast:
                 self.show_toast("No supported files found in the selected folder", "info")
-        else:
-            # Sort files by path
-            files_found.sort()
-            for file_path in files_found:
-                # Show subdirectory structure if present
-                if os.path.sep in file_path:
-                    display_path = f"📁 {file_path}"
-                else:
-                    display_path = f"📄 {file_path}"
-                self.file_listbox.insert(tk.END, display_path)
-            
-            if show_toast:
-                depth_text = f" (depth: {self.recursion_depth.get()})" if self.recursion_depth.get() > 0 else ""
-                self.show_toast(f"Found {len(files_found)} supported file(s){depth_text}", "info")
+        elif found and show_toast:
+            depth_text = f" (depth: {depth})" if depth > 0 else ""
+            change_text = ""
+            if changes and any(changes):
+                added, removed, modified = changes
+                change_text = f"\n{len(added)} added, {len(removed)} removed, {len(modified)} modified since last scan"
+            self.show_toast(f"Found {found} supported file(s){depth_text}{change_text}", "info")
         
         # Hide progress bar
         self._hide_folder_progress()
@@ -2910,113 +4374,593 @@ class ModernWordCloudApp:
     def select_all_files(self):
         """Select all files in the listbox"""
         # First check if there are any files
-        if self.file_listbox.size() == 0:
-            self.show_toast("No files to select", "warning")
-            return
-        
-        # Check if the first item is "No supported files found"
-        first_item = self.file_listbox.get(0)
-        if first_item == "No supported files found":
+        if self.file_listbox.view_size() == 0:
             self.show_toast("No files to select", "warning")
             return
         
         # Select all items
-        self.file_listbox.selection_set(0, tk.END)
+        self.file_listbox.select_all()
         
         # Show message
-        file_count = self.file_listbox.size()
+        file_count = self.file_listbox.selection_count()
         self.show_toast(f"Selected all {file_count} file(s)", "info")
     
     def clear_file_selection(self):
         """Clear all file selections"""
-        self.file_listbox.selection_clear(0, tk.END)
-        self.text_content = ""
+        self.file_listbox.clear_selection()
+        self.text_content = TextCorpus()
         # Update source mode label
         self.update_mode_label()
         self.show_toast("File selection cleared", "info")
     
     def load_files(self):
         """Load selected files"""
-        selected_indices = self.file_listbox.curselection()
-        if not selected_indices:
+        # Resolve relative paths here - Tk widgets must not be read from the worker thread
+        rel_paths = self.file_listbox.selected_paths()
+        if not rel_paths:
             self.show_toast("Please select at least one file to load", "warning")
             return
         
-        # Run loading in a separate thread
-        threading.Thread(target=self._load_files_thread, args=(selected_indices,), daemon=True).start()
-    
-    def _load_files_thread(self, selected_indices):
-        """Thread function to load files with progress indication"""
-        # Show progress bar
-        self.root.after(0, self._show_file_load_progress)
+        try:
+            workers = max(1, int(self.extraction_workers.get()))
+        except (tk.TclError, ValueError):
+            workers = default_extraction_workers()
+        summary_mb = None
+        if self.approximate_counting.get():
+            try:
+                summary_mb = max(1, int(self.approximate_memory_mb.get()))
+            except (tk.TclError, ValueError):
+                summary_mb = 8
+        preview_tokens = None
+        if self.quick_preview.get():
+            try:
+                preview_tokens = max(PREVIEW_BLOCK_TOKENS, int(self.preview_token_budget.get()))
+            except (tk.TclError, ValueError):
+                preview_tokens = 2000000
         
-        self.text_content = ""
-        folder = self.working_folder.get()
+        # Run loading in a separate thread
+        threading.Thread(target=self._load_files_thread,
+                         args=(rel_paths, self.working_folder.get(), workers, summary_mb, preview_tokens,
+                               self.language_stopwords.get()),
+                         daemon=True).start()
+    
+    def _set_file_load_progress_text(self, text):
+        """Update the file loading progress label"""
+        self.file_load_progress_label.config(text=text)
+    
+    def _extraction_pool(self, workers):
+        """Create an ExtractionPool with the configured watchdog limits"""
+        return ExtractionPool(workers,
+                              task_timeout=self.extraction_timeout,
+                              max_tasks_per_worker=self.extraction_tasks_per_worker,
+                              memory_limit_mb=self.extraction_memory_limit_mb)
+    
+    def _split_documents(self, filepaths, workers):
+        """Find the ranges of large documents, returning ({index: ranges}, {index: error}).
+        
+        filepaths maps file indices to paths. Finding the ranges means parsing
+        the document, so isolated formats do it in the watched pool, where a
+        malformed file costs a timeout instead of hanging the load.
+        """
+        split_ranges, errors = {}, {}
+        isolated = []
+        for i, path in filepaths.items():
+            extractor = get_extractor(path)
+            try:
+                if os.path.getsize(path) < extractor.split_min_bytes:
+                    continue
+            except OSError:
+                continue  # Let extraction report the error
+            if extractor.isolated:
+                isolated.append(i)
+            else:
+                split_ranges[i] = extractor.split(path)
         
-        # Update source mode label
-        self.root.after(0, self.update_mode_label, "Files")
+        def on_result(i, result):
+            ranges, error = result
+            if error is not None:
+                errors[i] = error
+            else:
+                split_ranges[i] = ranges
         
-        for idx in selected_indices:
-            
-            # Remove icon prefix (either 📄 or 📁) to get the relative path
-            file_entry = self.file_listbox.get(idx)
-            if file_entry.startswith("📄 "):
-                rel_path = file_entry.replace("📄 ", "")
-            elif file_entry.startswith("📁 "):
-                rel_path = file_entry.replace("📁 ", "")
+        if isolated:
+            self.print_debug(f"Counting pages of {len(isolated)} large document(s) in the extraction pool")
+            try:
+                self._extraction_pool(workers).run(((i, _split_worker, (filepaths[i],)) for i in isolated),
+                                                   on_result)
+            except OSError as e:
+                self.print_warning(f"Extraction process pool failed, extracting large documents whole: {e}")
+        return {i: ranges for i, ranges in split_ranges.items() if ranges}, errors
+    
+    def _extract_files(self, filepaths, workers, on_text=None):
+        """Extract text from files, in parallel when possible, returning (text, error) in input order.
+        
+        With on_text set, each file's (text, error) is passed to
+        on_text(index, result) as soon as it is ready and only the error is
+        kept, so the texts aren't all held until the last file is done.
+        """
+        results = [None] * len(filepaths)
+        total = len(filepaths)
+        cache = getattr(self, 'extraction_cache', None)
+        cache_failed = False
+        
+        def complete(i, result, cached=False):
+            nonlocal cache_failed
+            text, error = result
+            if cache is not None and not cached and not cache_failed and error is None and fingerprints[i] is not None:
+                try:
+                    cache.put(fingerprints[i], text)
+                except OSError as e:
+                    cache_failed = True
+                    self.print_warning(f"Failed to update extraction cache: {e}")
+            if on_text is not None:
+                on_text(i, result)
+                result = ("", error)  # Dropped once handed over
+            results[i] = result
+        
+        # Serve unchanged files from the extraction cache
+        fingerprints = [None] * total
+        if cache is not None:
+            for i, path in enumerate(filepaths):
+                try:
+                    fingerprints[i] = cache.fingerprint(path)
+                except OSError:
+                    continue  # Let extraction report the error
+                text = cache.get(fingerprints[i])
+                if text is not None:
+                    complete(i, (text, None), cached=True)
+            hits = sum(1 for result in results if result is not None)
+            self.print_debug(f"Extraction cache: {hits}/{total} hit(s)")
+        
+        pending = [i for i in range(total) if results[i] is None]
+        done = total - len(pending)
+        
+        # Large documents (e.g. PDFs) that can be split get one task per range
+        split_ranges, split_errors = {}, {}
+        if workers > 1:
+            splittable = {i: filepaths[i] for i in pending
+                          if os.path.isfile(filepaths[i]) and get_extractor(filepaths[i]) is not None
+                          and get_extractor(filepaths[i]).split is not None}
+            if splittable:
+                split_ranges, split_errors = self._split_documents(splittable, workers)
+        for i, error in split_errors.items():
+            self.print_warning(f"Skipping {filepaths[i]}: {error}")
+            complete(i, ("", error))
+            done += 1
+        
+        # One task per file or range
+        tasks = []  # (file index, part index, worker function, args)
+        parts = {}
+        tar_members = {}  # .tar.gz path -> {member name: file index}
+        for i in pending:
+            if i in split_errors:
+                continue
+            archive_path = None if os.path.isfile(filepaths[i]) else split_archive_path(filepaths[i])
+            if archive_path and archive_kind(archive_path[0]) == 'tar':
+                # Read in one pass over the archive below rather than seeking to each member
+                parts[i] = [None]
+                tar_members.setdefault(archive_path[0], {})[archive_path[1]] = i
+                continue
+            ranges = split_ranges.get(i)
+            if ranges:
+                self.print_debug(f"Splitting {filepaths[i]} into {len(ranges)} ranges")
+                parts[i] = [None] * len(ranges)
+                tasks.extend((i, n, _extract_range_worker, (filepaths[i], start, stop))
+                             for n, (start, stop) in enumerate(ranges))
             else:
-                rel_path = file_entry
+                parts[i] = [None]
+                tasks.append((i, 0, _extract_file_text_worker, (filepaths[i],)))
+        
+        def finish_part(i, n, result):
+            nonlocal done
+            parts[i][n] = result
+            if any(part is None for part in parts[i]):
+                return
+            # Join page ranges back in page order; any failed range fails the file
+            errors = [error for _, error in parts[i] if error is not None]
+            result = ("", errors[0]) if errors else (''.join(text for text, _ in parts[i]), None)
+            parts[i] = None
+            complete(i, result)
+            done += 1
+            self.root.after(0, self._set_file_load_progress_text,
+                            f"Loading file contents... ({done}/{total})")
+        
+        # Isolated parsers run in watched worker processes; plain text alone is read in-process
+        extractors = {i: get_extractor(filepaths[i]) for i in parts}
+        in_pool = lambda i: extractors[i] is None or extractors[i].process_safe
+        pool_tasks = [(i, n, worker, args) for i, n, worker, args in tasks if in_pool(i)]
+        pool_members = [i for members in tar_members.values() for i in members.values() if in_pool(i)]
+        
+        def tar_member_tasks(inline):
+            """Stream each .tar.gz once, yielding its members as extraction tasks as they are read"""
+            for archive, members in tar_members.items():
+                wanted = {member: i for member, i in members.items() if parts[i] is not None}
+                error = "Not found in archive"
+                try:
+                    for member, data in iter_archive_members(archive, list(wanted)):
+                        i = wanted.pop(member, None)
+                        if i is None:
+                            continue
+                        if inline or not in_pool(i):
+                            finish_part(i, 0, _extract_bytes_worker(member, data))
+                        else:
+                            yield i, 0, _extract_bytes_worker, (member, data)
+                except Exception as e:
+                    error = str(e)
+                for i in wanted.values():
+                    finish_part(i, 0, ("", error))
+        
+        if (any(extractors[i] is None or extractors[i].isolated for i in
+                [task[0] for task in pool_tasks] + pool_members)
+                or (workers > 1 and len(pool_tasks) + len(pool_members) > 1)):
+            pool = self._extraction_pool(workers)
             
-            filepath = os.path.join(folder, rel_path)
+            def on_result(key, result):
+                if result[1] is not None:
+                    self.print_warning(f"Skipping {filepaths[key[0]]}: {result[1]}")
+                finish_part(*key, result)
             
             try:
-                if filepath.lower().endswith('.txt'):
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        self.text_content += f.read() + "\n"
-                
-                elif filepath.lower().endswith('.pdf'):
-                    with open(filepath, 'rb') as f:
-                        pdf_reader = PyPDF2.PdfReader(f)
-                        for page in pdf_reader.pages:
-                            page_text = page.extract_text()
-                            # Fix common PDF extraction issues
-                            # Replace soft hyphens and rejoin split words
-                            page_text = page_text.replace('\u00AD', '')  # Remove soft hyphens
-                            page_text = page_text.replace('-\n', '')  # Rejoin hyphenated words
-                            page_text = page_text.replace('\n', ' ')  # Replace newlines with spaces
-                            self.text_content += page_text + " "
-                
-                elif filepath.lower().endswith('.docx'):
-                    doc = Document(filepath)
-                    for paragraph in doc.paragraphs:
-                        self.text_content += paragraph.text + "\n"
-                
-                elif filepath.lower().endswith('.pptx'):
-                    prs = Presentation(filepath)
-                    for slide in prs.slides:
-                        for shape in slide.shapes:
-                            if hasattr(shape, "text"):
-                                self.text_content += shape.text + "\n"
-                
-            except Exception as e:
-                self.root.after(0, self.show_toast, f"Error reading {rel_path}: {str(e)}", "danger")
-                self.root.after(0, self.show_toast, f"Error reading {rel_path}", "danger")
+                all_tasks = itertools.chain(pool_tasks, tar_member_tasks(inline=False))
+                pool.run((((i, n), worker, args) for i, n, worker, args in all_tasks), on_result)
+            except OSError as e:
+                # Fall back to in-process extraction for anything the pool didn't finish
+                self.print_warning(f"Extraction process pool failed, continuing serially: {e}")
+        
+        for i, n, worker, args in tasks:
+            if parts[i] is not None and parts[i][n] is None:
+                finish_part(i, n, worker(*args))
+        for _ in tar_member_tasks(inline=True):
+            pass
         
-        # Show success message in the message bar
-        total_words = len(self.text_content.split())
-        self.root.after(0, self.show_toast, f"Successfully loaded {len(selected_indices)} file(s) with approximately {total_words:,} words", "success")
-        self.root.after(0, self.show_toast, f"Files loaded successfully!", "success")
+        if cache is not None and not cache_failed:
+            try:
+                cache.save()
+            except OSError as e:
+                self.print_warning(f"Failed to update extraction cache: {e}")
+        
+        return results
+    
+    def _count_chunks(self, jobs, vocabulary, workers, label, summary=None):
+        """Count words chunk by chunk and merge the partial counts, returning {key: (TokenCounts, error)}.
+        
+        jobs maps a key to (name, make_tasks), where make_tasks() yields
+        (worker, args) for each chunk; it is called again to redo the
+        unfinished chunks in process if the pool fails. Chunks run in the
+        extraction pool when workers > 1, and their Counters are merged as
+        they arrive, so memory stays bounded by the chunk size and vocabulary.
+        Counts are encoded with vocabulary, the corpus's own, since
+        self.vocabulary may be replaced while a load runs. With a HeavyHitters
+        summary the counts go into it as they arrive and the TokenCounts stay
+        empty; the summary can't take counts back, so chunks of a document
+        that fails part way stay counted and the caller must not count that
+        document again.
+        """
+        totals = {key: TokenCounts() for key in jobs}
+        errors = {key: None for key in jobs}
+        finished = set()
+        
+        def tasks():
+            for key, (name, make_tasks) in jobs.items():
+                for n, (worker, args) in enumerate(make_tasks()):
+                    if errors[key] is not None:
+                        break
+                    if (key, n) not in finished:
+                        yield (key, n), worker, args
+        
+        def on_result(task_key, result):
+            counter, error = result
+            key = task_key[0]
+            finished.add(task_key)
+            if error is not None:
+                if errors[key] is None and summary is not None:
+                    self.print_warning(f"Stopped counting {jobs[key][0]} (it may be partly counted): {error}")
+                elif errors[key] is None:
+                    self.print_warning(f"Skipping {jobs[key][0]}: {error}")
+                errors[key] = errors[key] or error
+            elif errors[key] is None and summary is not None:
+                summary.update(counter)
+            elif errors[key] is None:
+                totals[key].add(vocabulary.encode_counts(counter))
+            self.root.after(0, self._set_file_load_progress_text,
+                            f"{label}... ({len(finished)} chunks)")
+        
+        serial = workers <= 1
+        if not serial:
+            pool = self._extraction_pool(workers)
+            try:
+                pool.run(tasks(), on_result)
+            except OSError as e:
+                self.print_warning(f"Extraction process pool failed, continuing serially: {e}")
+                serial = True
+        
+        if serial:
+            for task_key, worker, args in tasks():
+                on_result(task_key, worker(*args))
+        
+        return {key: (totals[key], None) if errors[key] is None else ("", errors[key]) for key in jobs}
+    
+    def _load_preview(self, filepaths, vocabulary, workers, budget, detect_languages=False):
+        """Generate a quick preview from a random sample of token blocks.
+        
+        Files are read in random order, in growing batches, until about
+        PREVIEW_OVERSAMPLE * budget tokens have been seen; very large text
+        files contribute randomly chosen chunks instead of their whole text.
+        A reservoir keeps a uniform sample of budget tokens in blocks, and the
+        rank stability of the top words is estimated by bootstrapping those
+        blocks. Returns True if a preview was generated.
+        """
+        rng = random.Random()
+        reservoir = BlockReservoir(budget, rng=rng)
+        target = budget * PREVIEW_OVERSAMPLE
+        order = list(range(len(filepaths)))
+        rng.shuffle(order)
+        batch_size = max(1, workers)
+        position = 0
+        sampled_files = 0
+        while position < len(order) and reservoir.seen_tokens < target:
+            batch = order[position:position + batch_size]
+            position += len(batch)
+            batch_size *= 2
+            to_extract = []
+            for i in batch:
+                extractor = get_extractor(filepaths[i])
+                ranges = None
+                if extractor is not None and extractor.count_ranges and extractor.extract_range:
+                    try:
+                        ranges = extractor.count_ranges(filepaths[i])
+                    except (OSError, ValueError):
+                        ranges = None
+                if not ranges:
+                    to_extract.append(i)
+                    continue
+                # Read random chunks of a huge file rather than all of it
+                sampled_files += 1
+                language = None
+                for start, stop in rng.sample(ranges, len(ranges)):
+                    if reservoir.seen_tokens >= target:
+                        break
+                    try:
+                        text = extractor.extract_range(filepaths[i], start, stop)
+                    except (OSError, ValueError):
+                        break
+                    if detect_languages:
+                        language = language or detect_language(text)
+                    reservoir.add(vocabulary.encode(tokenize_text(text)), language)
+            if to_extract:
+                for text, error in self._extract_files([filepaths[i] for i in to_extract], workers):
+                    if error is None:
+                        reservoir.add(vocabulary.encode(tokenize_text(text)),
+                                      detect_language(text) if detect_languages else None)
+                        sampled_files += 1
+            self.root.after(0, self._set_file_load_progress_text,
+                            f"Sampling for quick preview... ({reservoir.seen_tokens:,} tokens)")
+        if not reservoir.blocks:
+            return False
         
-        # Hide progress bar
-        self.root.after(0, self._hide_file_load_progress)
+        preview = TextCorpus(vocabulary=vocabulary)
+        for n, (block, language) in enumerate(reservoir.blocks):
+            preview.add_document(f"sample block {n + 1}", block, len(block), language)
+        try:
+            top_n = min(50, int(self.max_words.get()))
+        except (tk.TclError, ValueError):
+            top_n = 50
+        stability = rank_stability(lambda blocks: self.filter_words(preview, blocks),
+                                   len(reservoir.blocks), top_n=top_n, rng=rng)
+        self.print_debug(f"Quick preview: {preview.word_count():,} sampled tokens from {sampled_files} of "
+                         f"{len(filepaths)} file(s), top {top_n} rank stability {stability:.0%}")
+        
+        self.text_content = preview
+        self.root.after(0, self.show_toast,
+                        f"Quick preview from {preview.word_count():,} sampled words ({sampled_files} of "
+                        f"{len(filepaths)} files): top {top_n} words about {stability:.0%} stable.\n"
+                        f"Exact counts are loading in the background.", "info")
+        self.root.after(0, self.generate_wordcloud)
+        self.root.after(0, self._set_file_load_progress_text, "Loading all files for exact counts...")
+        return True
+    
+    def _replace_preview(self):
+        """Regenerate from the exact counts once the full load behind a quick preview finishes"""
+        self.show_toast("Exact counts loaded - updating the preview", "success")
+        if str(self.generate_btn.cget('state')) == DISABLED:
+            self.regenerate_pending = True  # Picked up by _generation_complete
+        else:
+            self.generate_wordcloud()
+    
+    def _load_files_thread(self, rel_paths, folder, workers, summary_mb=None, preview_tokens=None,
+                           detect_languages=False):
+        """Thread function to load files with progress indication.
+        
+        With summary_mb set, word counts go into a HeavyHitters summary of
+        that size instead of keeping every token (approximate mode). With
+        preview_tokens set, a quick preview cloud is generated from a sample
+        of that many tokens first, and the full load follows in the background.
+        Document languages are only detected with detect_languages set (for
+        per-language stopwords); otherwise they are left as NOT_DETECTED.
+        """
+        # Show progress bar
+        self.root.after(0, self._show_file_load_progress)
+        
+        try:
+            summary = HeavyHitters(summary_mb) if summary_mb else None
+            # Approximate loads keep no tokens, so they neither use nor fill the document store
+            store = self.document_store if summary is None else {}
+            corpus = TextCorpus(vocabulary=self.vocabulary, summary=summary)
+            
+            # Update source mode label
+            self.root.after(0, self.update_mode_label, "Files")
+            
+            filepaths = [os.path.abspath(os.path.join(folder, rel_path)) for rel_path in rel_paths]
+            
+            previewed = False
+            if preview_tokens:
+                previewed = self._load_preview(filepaths, corpus.vocabulary, workers, preview_tokens,
+                                               detect_languages)
+            if not previewed:
+                self.text_content = corpus
+            
+            # Files loaded earlier and unchanged since are merged from their encoded tokens
+            stats = [None] * len(filepaths)
+            pending = []
+            for i, filepath in enumerate(filepaths):
+                try:
+                    stats[i] = os.stat(filepath)
+                except OSError:
+                    pending.append(i)
+                    continue
+                entry = store.get(filepath)
+                if not (entry and entry['size'] == stats[i].st_size and entry['mtime'] == stats[i].st_mtime_ns):
+                    pending.append(i)
+            
+            # Very large files whose extractor can count ranges are counted without loading their text
+            count_ranges = {}
+            for i in pending:
+                extractor = get_extractor(filepaths[i])
+                if extractor is not None and extractor.count_ranges is not None:
+                    try:
+                        ranges = extractor.count_ranges(filepaths[i])
+                    except (OSError, ValueError):
+                        ranges = None  # Let extraction report the error
+                    if ranges:
+                        count_ranges[i] = ranges
+            pending = [i for i in pending if i not in count_ranges]
+            
+            # Approximate mode adds each text to the summary as it arrives instead of holding them all
+            def add_to_summary(j, result):
+                text, error = result
+                if error is None:
+                    corpus.append(text)
+            on_text = add_to_summary if summary is not None else None
+            
+            self.print_debug(f"Extracting {len(pending)} of {len(filepaths)} file(s) with {workers} worker(s)")
+            results = dict(zip(pending, self._extract_files([filepaths[i] for i in pending], workers, on_text)))
+            if count_ranges:
+                self.print_debug(f"Counting {len(count_ranges)} large file(s) in chunks")
+                results.update(self._count_chunks(
+                    {i: (filepaths[i], lambda path=filepaths[i], ranges=ranges:
+                         ((_count_range_worker, (path, start, stop)) for start, stop in ranges))
+                     for i, ranges in count_ranges.items()},
+                    corpus.vocabulary, workers, "Counting large files", summary))
+            
+            # Tokenize big extracted texts across the worker processes
+            counted = {}
+            if workers > 1 and summary is None:
+                big_texts = {i: text for i, (text, error) in results.items()
+                             if error is None and isinstance(text, str) and len(text) >= PARALLEL_TOKENIZE_MIN_DOC_CHARS}
+                if sum(map(len, big_texts.values())) >= PARALLEL_TOKENIZE_MIN_CHARS:
+                    self.print_debug(f"Tokenizing {len(big_texts)} large document(s) in {workers} processes")
+                    counted = self._count_chunks(
+                        {i: (filepaths[i], lambda text=text:
+                             ((_count_text_worker, (chunk,)) for chunk in split_text_chunks(text)))
+                         for i, text in big_texts.items()},
+                        corpus.vocabulary, workers, "Counting words", summary)
+                    del big_texts
+            
+            # Gather results back in selection order
+            for i, rel_path in enumerate(rel_paths):
+                if i not in results:
+                    entry = store[filepaths[i]]
+                    corpus.add_document(rel_path, entry['ids'], entry['chars'], entry.get('language'))
+                    continue
+                text, error = results.pop(i)  # Dropped once encoded
+                if error is not None:
+                    self.root.after(0, self.show_toast, f"Error reading {rel_path}: {error}", "danger")
+                    self.root.after(0, self.show_toast, f"Error reading {rel_path}", "danger")
+                    if summary is not None and i in count_ranges:
+                        self.root.after(0, self.show_toast,
+                                        f"Approximate counts may include part of {rel_path}", "warning")
+                    continue
+                if summary is not None and not isinstance(text, TokenCounts):
+                    continue  # Already added to the summary as it was extracted
+                if summary is not None:
+                    language = None
+                elif detect_languages:
+                    language = self._document_language(filepaths[i], stats[i], text, count_ranges.get(i))
+                else:
+                    language = NOT_DETECTED
+                if isinstance(text, TokenCounts):
+                    # Counted in chunks - the size in bytes stands in for the character count
+                    token_ids, char_count = text, stats[i].st_size
+                    corpus.add_document(rel_path, token_ids, char_count, language)
+                else:
+                    tokens, count_error = counted.get(i, (None, None))
+                    if count_error is not None:
+                        tokens = None  # Tokenize it here instead
+                    token_ids = corpus.append(text, name=rel_path, tokens=tokens, language=language)
+                    char_count = len(text)
+                if stats[i] is not None and summary is None:
+                    store[filepaths[i]] = {
+                        'size': stats[i].st_size,
+                        'mtime': stats[i].st_mtime_ns,
+                        'ids': token_ids,
+                        'chars': char_count,
+                        'language': language
+                    }
+            
+            # Build the frequency table now so the first generate doesn't have to
+            if summary is None:
+                corpus.token_counts()
+                cache = getattr(self, 'extraction_cache', None)
+                if cache is not None and detect_languages:
+                    try:
+                        cache.save()  # Persist newly detected languages
+                    except OSError as e:
+                        self.print_warning(f"Failed to update extraction cache: {e}")
+            self.text_content = corpus
+            if previewed:
+                self.root.after(0, self._replace_preview)
+            
+            # Show success message in the message bar
+            total_words = corpus.word_count()
+            self.root.after(0, self.show_toast, f"Successfully loaded {len(rel_paths)} file(s) with approximately {total_words:,} words", "success")
+            if summary is not None:
+                overcount, missed = summary.error_bounds()
+                self.print_debug(f"Approximate counts: {len(summary.counts)} candidate words, "
+                                 f"{summary.memory_bytes() / 1024 / 1024:.1f} MB, "
+                                 f"estimates at most +{overcount:,}, omitted words under {missed + 1:,}")
+                self.root.after(0, self.show_toast,
+                                f"Approximate counts: each word count is at most {overcount:,} too high", "info")
+            self.root.after(0, self.show_toast, f"Files loaded successfully!", "success")
+        except Exception as e:
+            self.print_debug(f"Error in _load_files_thread: {str(e)}")
+            import traceback
+            self.print_debug(traceback.format_exc())
+            self.root.after(0, self.show_toast, f"Error loading files: {e}", "danger")
+        finally:
+            # Hide progress bar
+            self.root.after(0, self._set_file_load_progress_text, "Loading file contents...")
+            self.root.after(0, self._hide_file_load_progress)
+    
+    def _document_language(self, filepath, stat, text, ranges=None):
+        """Language of a loaded file, from the extraction cache or detected from its text"""
+        cache = getattr(self, 'extraction_cache', None)
+        if cache is not None and stat is not None:
+            language = cache.get_language(filepath, stat.st_size, stat.st_mtime_ns)
+            if language is not None:
+                return language
+        if isinstance(text, TokenCounts):
+            # Counted without keeping its text - detect from the first chunk
+            extractor = get_extractor(filepath)
+            if not ranges or extractor is None or extractor.extract_range is None:
+                return None
+            try:
+                text = extractor.extract_range(filepath, *ranges[0])
+            except (OSError, ValueError):
+                return None
+        language = detect_language(text)
+        if cache is not None and language is not None:
+            cache.put_language(filepath, language)
+        return language
     
     def use_pasted_text(self):
         """Use text from text input widget"""
-        self.text_content = self.text_input.get('1.0', tk.END).strip()
+        text = self.text_input.get('1.0', tk.END).strip()
+        self.text_content = TextCorpus()
+        self.text_content.append(text, language=detect_language(text))
         if self.text_content:
             # Update source mode label
             self.update_mode_label(source="Custom Text")
-            word_count = len(self.text_content.split())
+            word_count = self.text_content.word_count()
             self.show_toast(f"Text loaded successfully with approximately {word_count:,} words", "success")
             self.show_toast("Text loaded successfully", "success")
         else:
@@ -3068,7 +5012,7 @@ class ModernWordCloudApp:
         if source is None:
             if self.text_content:
                 # Check if it's from files or custom text
-                if hasattr(self, 'file_listbox') and self.file_listbox.curselection():
+                if hasattr(self, 'file_listbox') and self.file_listbox.selection_count():
                     source = "Files"
                 else:
                     source = "Custom Text"
@@ -3085,7 +5029,7 @@ class ModernWordCloudApp:
         
         # Update source label
         if self.text_content and source != "None":
-            word_count = len(self.text_content.split())
+            word_count = self.text_content.word_count()
             source_text = f"{source} ({word_count:,} words)"
         else:
             source_text = source
@@ -3190,18 +5134,26 @@ class ModernWordCloudApp:
                 pass
     
     def update_forbidden_words(self, show_toast=True):
-        """Update forbidden words set"""
+        """Recompile the forbidden word matcher if the text area changed"""
         text = self.forbidden_text.get('1.0', tk.END).strip()
         # Only use the words explicitly listed in the text area, not STOPWORDS
-        self.forbidden_words = set()
-        if text:
-            custom_forbidden = set(word.strip().lower() for word in text.split('\n') if word.strip())
-            self.forbidden_words.update(custom_forbidden)
-            self.print_debug(f"Custom forbidden words: {self.forbidden_words}")
+        if text != self._forbidden_source:
+            self.forbidden_words = ForbiddenMatcher(text.split('\n'))
+            self._forbidden_source = text
+            matcher = self.forbidden_words
+            self.print_debug(f"Compiled forbidden words: {len(matcher.exact)} exact, "
+                             f"{len(matcher.prefixes)}/{len(matcher.suffixes)} prefix/suffix trie roots, "
+                             f"regex: {'yes' if matcher.regex else 'no'}, {len(matcher.separate)} separate")
+            for pattern, message in matcher.errors:
+                self.print_warning(f"Ignoring invalid forbidden pattern '{pattern}': {message}")
         
         self.print_debug(f"Updated forbidden words from GUI text area: {len(self.forbidden_words)} words")
         if show_toast:
-            self.show_toast(f"Updated forbidden words ({len(self.forbidden_words)} total)", "info")
+            if self.forbidden_words.errors:
+                self.show_toast(f"Updated forbidden words ({len(self.forbidden_words)} total, "
+                                f"{len(self.forbidden_words.errors)} invalid pattern(s) ignored)", "warning")
+            else:
+                self.show_toast(f"Updated forbidden words ({len(self.forbidden_words)} total)", "info")
     
     def on_color_select(self):
         """Handle color scheme selection"""
@@ -4235,73 +6187,117 @@ class ModernWordCloudApp:
             if show_toast:
                 self.show_toast("RGB mode enabled - solid background", "info")
     
-    def filter_words(self, text):
-        """Filter words based on length and forbidden words"""
-        # Clean up text first
-        # Remove extra spaces and normalize whitespace
-        text = ' '.join(text.split())
+    def filter_words(self, corpus, doc_indices=None):
+        """Filter words by length and forbidden words using the corpus token counts.
         
-        # Extract words - include apostrophes for contractions
-        words = re.findall(r"\b[\w']+\b", text.lower())
+        Returns a word -> count table ready for WordCloud.generate_from_frequencies.
+        """
+        if corpus.summary is not None:
+            return self._filter_summary(corpus.summary)
         
-        # Additional cleanup - remove standalone punctuation and numbers
-        words = [w for w in words if not w.isdigit() and len(w) > 0]
+        # Counts are cached on the corpus, so filter changes don't re-tokenize
+        counts = corpus.token_counts(doc_indices)
+        size = len(counts)
+        canonical, lengths, numeric = corpus.vocabulary.attributes()
+        lengths = lengths[:size]
+        numeric = numeric[:size]
         
         # Update forbidden words (don't show toast during generation)
         self.update_forbidden_words(show_toast=False)
         
-        # Filter words
-        filtered_words = []
         min_len = self.min_word_length.get()
         max_len = self.max_word_length.get()
         
-        self.print_debug(f"Filtering words: min_length={min_len}, max_length={max_len}, total_words={len(words)}")
-        
-        # Count words by length for debugging
-        length_counts = {}
-        filtered_by_length = 0
-        filtered_by_forbidden = 0
+        # Standalone numbers are dropped, as WordCloud.generate did
+        present = (counts > 0) & ~numeric
+        self.print_debug(f"Filtering words: min_length={min_len}, max_length={max_len}, "
+                         f"total_words={int(counts[present].sum())}, unique_words={int(present.sum())}")
+        
+        # Per-document stopwords, using the pack for each document's detected language
+        if self.language_stopwords.get():
+            stopped = self._language_stopword_counts(corpus, doc_indices, counts)
+            self.print_debug(f"Removed {int(stopped.sum())} language stopword occurrences")
+            counts = counts - stopped
+            present &= counts > 0
+        
+        # Vectorized masks over the vocabulary
+        length_ok = (lengths >= min_len) & (lengths <= max_len)
+        forbidden = self.forbidden_words.mask(corpus.vocabulary, size)
+        keep = present & length_ok & ~forbidden
+        filtered_by_length = int(counts[present & ~length_ok].sum())
+        filtered_by_forbidden = int(counts[present & length_ok & forbidden].sum())
         
         # Debug: show first 10 words being processed
         debug_limit = 10
-        words_shown = 0
-        
-        for word in words:
-            word_len = len(word)
-            length_counts[word_len] = length_counts.get(word_len, 0) + 1
-            
-            # Detailed debug for first few words
-            if words_shown < debug_limit:
-                if min_len <= word_len <= max_len:
-                    if word not in self.forbidden_words:
-                        self.print_debug(f"  ✓ '{word}' (len={word_len}) - KEPT")
-                        filtered_words.append(word)
-                    else:
-                        self.print_debug(f"  ✗ '{word}' (len={word_len}) - FORBIDDEN")
-                        filtered_by_forbidden += 1
-                else:
-                    self.print_debug(f"  ✗ '{word}' (len={word_len}) - TOO SHORT/LONG")
-                    filtered_by_length += 1
-                words_shown += 1
+        for word_id in np.flatnonzero(present)[:debug_limit]:
+            word = canonical[word_id]
+            if keep[word_id]:
+                verdict, mark = "KEPT", "✓"
+            elif forbidden[word_id] and length_ok[word_id]:
+                verdict, mark = "FORBIDDEN", "✗"
             else:
-                # Just count for remaining words
-                if min_len <= word_len <= max_len:
-                    if word not in self.forbidden_words:
-                        filtered_words.append(word)
-                    else:
-                        filtered_by_forbidden += 1
-                else:
-                    filtered_by_length += 1
+                verdict, mark = "TOO SHORT/LONG", "✗"
+            self.print_debug(f"  {mark} '{word}' (len={lengths[word_id]}, count={counts[word_id]}) - {verdict}")
+        
+        # Possessive and plain forms share a canonical word, so merge while building the table
+        frequencies = {}
+        for word_id in np.flatnonzero(keep):
+            word = canonical[word_id]
+            frequencies[word] = frequencies.get(word, 0) + int(counts[word_id])
+        frequencies = normalize_plurals(frequencies)
         
         # Log length distribution for words under min_length
-        short_words = {k: v for k, v in length_counts.items() if k < min_len}
-        if short_words:
-            self.print_debug(f"Words shorter than min_length ({min_len}): {short_words}")
+        if self.debug_mode:
+            length_counts = np.bincount(lengths[present], weights=counts[present], minlength=min_len)
+            short_words = {k: int(v) for k, v in enumerate(length_counts[:min_len]) if v}
+            if short_words:
+                self.print_debug(f"Words shorter than min_length ({min_len}): {short_words}")
         
-        self.print_debug(f"After filtering: {len(filtered_words)} words remain")
+        self.print_debug(f"After filtering: {sum(frequencies.values())} words remain ({len(frequencies)} unique)")
         self.print_debug(f"Filtered out: {filtered_by_length} by length, {filtered_by_forbidden} by forbidden list")
         
-        return ' '.join(filtered_words)
+        return frequencies
+    
+    def _language_stopword_counts(self, corpus, doc_indices, counts):
+        """Per-id counts of tokens that are stopwords in their own document's language"""
+        corpus.detect_languages(doc_indices)  # Documents loaded while the option was off
+        groups = corpus.language_groups(doc_indices)
+        selected = len(corpus.documents) if doc_indices is None else len(doc_indices)
+        stopped = np.zeros(len(counts), dtype=np.int64)
+        for language, indices in groups.items():
+            if language not in STOPWORD_LANGUAGES:
+                continue
+            matcher = self._stopword_matchers.get(language)
+            if matcher is None:
+                try:
+                    matcher = ForbiddenMatcher(load_stopwords(language))
+                except OSError as e:
+                    self.print_warning(f"Could not load {STOPWORD_LANGUAGES[language]} stopwords: {e}")
+                    continue
+                self._stopword_matchers[language] = matcher
+            # A single-language selection can reuse the counts already computed
+            language_counts = counts if len(indices) == selected else corpus.token_counts(indices)
+            stopped += np.where(matcher.mask(corpus.vocabulary, len(counts)), language_counts[:len(counts)], 0)
+        return stopped
+    
+    def _filter_summary(self, summary):
+        """filter_words for approximate mode - applies the same filters to the summary's candidates"""
+        self.update_forbidden_words(show_toast=False)
+        min_len = self.min_word_length.get()
+        max_len = self.max_word_length.get()
+        
+        frequencies = {}
+        for word, count in summary.items().items():
+            word = word[:-2] if word.endswith("'s") else word
+            if word.isdigit() or not (min_len <= len(word) <= max_len) or word in self.forbidden_words:
+                continue
+            frequencies[word] = frequencies.get(word, 0) + count
+        frequencies = normalize_plurals(frequencies)
+        
+        overcount, missed = summary.error_bounds()
+        self.print_debug(f"Approximate filtering: {len(frequencies)} of {len(summary.counts)} candidates kept "
+                         f"from {summary.total:,} tokens; counts at most +{overcount:,}")
+        return frequencies
     
     def validate_configuration(self):
         """Validate configuration and return list of warnings/errors"""
@@ -4346,10 +6342,8 @@ class ModernWordCloudApp:
             issues.append(("warning", "High scale value may cause very slow generation"))
         
         # Check if all words might be filtered
-        text_preview = self.text_content[:1000] if self.text_content else ""
-        if text_preview:
-            words = text_preview.split()
-            avg_word_length = sum(len(w) for w in words) / len(words) if words else 0
+        if self.text_content:
+            avg_word_length = self.text_content.average_word_length()
             if avg_word_length < self.min_word_length.get():
                 issues.append(("warning", f"Average word length ({avg_word_length:.1f}) is less than minimum filter ({self.min_word_length.get()}). Most words may be filtered out"))
         
@@ -4398,10 +6392,10 @@ class ModernWordCloudApp:
     def _generate_wordcloud_thread(self):
         """Generate word cloud (thread function)"""
         try:
-            # Filter words
-            filtered_text = self.filter_words(self.text_content)
+            # Count and filter words
+            frequencies = self.filter_words(self.text_content)
             
-            if not filtered_text:
+            if not frequencies:
                 self.root.after(0, lambda: self.show_toast("No words found after filtering", "warning"))
                 return
             
@@ -4506,9 +6500,6 @@ class ModernWordCloudApp:
                 elif self.outline_width.get() > 0 and self.rgba_mode.get():
                     self.print_warning("Outlines disabled in RGBA mode due to library compatibility")
             
-            # Use our forbidden words instead of default STOPWORDS
-            wc_params['stopwords'] = self.forbidden_words
-            
             # Log mask info if using one
             if mask_to_use is not None:
                 mask_shape = mask_to_use.shape
@@ -4523,7 +6514,8 @@ class ModernWordCloudApp:
                 total_pixels = mask_shape[0] * mask_shape[1]
                 self.print_debug(f"Mask available area: {available_pixels:,} pixels ({available_pixels/total_pixels*100:.1f}% of total)")
             
-            self.wordcloud = WordCloud(**wc_params).generate(filtered_text)
+            # Words are already counted and filtered, so skip WordCloud's own tokenizer
+            self.wordcloud = WordCloud(**wc_params).generate_from_frequencies(frequencies)
             
             # Update UI in main thread
             self.root.after(0, self._update_preview)
@@ -4633,6 +6625,9 @@ class ModernWordCloudApp:
         self.progress.stop()
         self.progress.pack_forget()
         self.generate_btn.config(state=NORMAL)
+        if self.regenerate_pending:
+            self.regenerate_pending = False
+            self.generate_wordcloud()
     
     def save_wordcloud(self):
         """Save generated word cloud"""
@@ -5203,6 +7198,10 @@ class ModernWordCloudApp:
                         pass
             
             # Apply input settings
+            if 'parallel_scan' in config and hasattr(self, 'parallel_scan'):
+                self.parallel_scan.set(config['parallel_scan'])
+            if 'scan_exclude' in config and hasattr(self, 'scan_exclude'):
+                self.set_scan_rules(ScanRules.from_config(config))
             if 'working_directory' in config and hasattr(self, 'working_folder'):
                 self.working_folder.set(config['working_directory'])
                 if config['working_directory'] and os.path.exists(config['working_directory']):
@@ -5210,6 +7209,23 @@ class ModernWordCloudApp:
                     self.root.after(100, lambda: self.populate_file_list(show_toast=False))
                     self.print_debug(f"Populated file list for directory: {config['working_directory']}")
             
+            if 'extraction_workers' in config and hasattr(self, 'extraction_workers'):
+                self.extraction_workers.set(max(1, int(config['extraction_workers'])))
+            if 'approximate_counting' in config and hasattr(self, 'approximate_counting'):
+                self.approximate_counting.set(config['approximate_counting'])
+                self.approximate_memory_mb.set(max(1, int(config.get('approximate_memory_mb', 8))))
+            if 'language_stopwords' in config and hasattr(self, 'language_stopwords'):
+                self.language_stopwords.set(config['language_stopwords'])
+            if 'quick_preview' in config and hasattr(self, 'quick_preview'):
+                self.quick_preview.set(config['quick_preview'])
+                self.preview_token_budget.set(max(PREVIEW_BLOCK_TOKENS, int(config.get('preview_token_budget', 2000000))))
+            if 'extraction_timeout' in config:
+                self.extraction_timeout = config['extraction_timeout']
+            if 'extraction_memory_limit_mb' in config:
+                self.extraction_memory_limit_mb = config['extraction_memory_limit_mb']
+            if 'extraction_tasks_per_worker' in config:
+                self.extraction_tasks_per_worker = config['extraction_tasks_per_worker']
+            
             # Load pasted text if present
             if 'pasted_text' in config and hasattr(self, 'text_input'):
                 self.text_input.delete('1.0', tk.END)
@@ -5357,6 +7373,23 @@ class ModernWordCloudApp:
         # Input settings
         if hasattr(self, 'working_folder'):
             config['working_directory'] = self.working_folder.get()
+        if hasattr(self, 'parallel_scan'):
+            config['parallel_scan'] = self.parallel_scan.get()
+        if hasattr(self, 'scan_exclude'):
+            config.update(self.get_scan_rules().to_config())
+        if hasattr(self, 'extraction_workers'):
+            config['extraction_workers'] = self.extraction_workers.get()
+            config['extraction_timeout'] = self.extraction_timeout
+            config['extraction_memory_limit_mb'] = self.extraction_memory_limit_mb
+            config['extraction_tasks_per_worker'] = self.extraction_tasks_per_worker
+        if hasattr(self, 'approximate_counting'):
+            config['approximate_counting'] = self.approximate_counting.get()
+            config['approximate_memory_mb'] = self.approximate_memory_mb.get()
+        if hasattr(self, 'language_stopwords'):
+            config['language_stopwords'] = self.language_stopwords.get()
+        if hasattr(self, 'quick_preview'):
+            config['quick_preview'] = self.quick_preview.get()
+            config['preview_token_budget'] = self.preview_token_budget.get()
         
         # Save pasted text if any
         if hasattr(self, 'text_input'):
@@ -5452,6 +7485,7 @@ class ModernWordCloudApp:
             self.forbidden_text.delete(1.0, tk.END)
             self.forbidden_text.insert(1.0, self.default_forbidden)
             self.update_forbidden_words(show_toast=False)
+            self.language_stopwords.set(False)
             
             # Reset color settings
             self.color_mode.set("preset")
@@ -5519,9 +7553,18 @@ class ModernWordCloudApp:
                     self.text_mask_preview_label.config(image='', text="Preview will appear here")
             
             # Reset working directory
+            self.file_scan_generation += 1  # Cancel any running scan
             self.working_folder.set("No folder selected")
+            self.reset_document_store()
+            self.extraction_workers.set(default_extraction_workers())
+            self.approximate_counting.set(False)
+            self.approximate_memory_mb.set(8)
+            self.quick_preview.set(False)
+            self.preview_token_budget.set(2000000)
+            if hasattr(self, 'scan_exclude'):
+                self.set_scan_rules(ScanRules())
             if hasattr(self, 'file_listbox'):
-                self.file_listbox.delete(0, tk.END)
+                self.file_listbox.clear()
             
             # Clear loaded text
             self.loaded_text = ""
@@ -5681,4 +7724,6 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # Required for process pools in the frozen (PyInstaller) executable
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
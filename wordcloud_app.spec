@@ -16,6 +16,8 @@ a = Analysis(
     datas=[
         # Include configuration files
         ('configs', 'configs'),
+        # Include stopword packs for per-language filtering
+        ('stopwords', 'stopwords'),
         # Include help/template files
         ('templates', 'templates'),
         # Include the icon
@@ -38,8 +40,6 @@ a = Analysis(
         'PIL._tkinter_finder',
         'numpy',
         'PyPDF2',
-        'docx',
-        'pptx',
         'markdown2',
         'tkinter',
         'tkinter.filedialog',